@@ -6,18 +6,22 @@ import os
 import queue
 import re
 import threading
+from functools import lru_cache
 from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Tuple, TypeVar
 
 # Enable raw log output with DEBUG=true environment variable
 RAW_LOG_MODE = os.getenv("DEBUG", "").lower() in ("true", "1", "yes")
 
+import orjson
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 
 from component_agent.graph import run_component_agent
 from component_agent.schemas import (
     ComponentDrilldownRequest,
     NavigationBreadcrumb,
+    NavigationNode,
+    SemanticMetadata,
     coerce_subagent_payload,
 )
 from orchestration_agent.graph import run_orchestration_agent
@@ -30,10 +34,8 @@ from ..schemas import (
     ComponentDTO,
     DrilldownRequest,
     DrilldownResponse,
-    NavigationNodeDTO,
     SemanticMetadataDTO,
     SystemOverviewDTO,
-    TokenMetrics,
     WorkspaceOverviewResponse,
 )
 
@@ -107,11 +109,15 @@ T = TypeVar("T")
 
 
 def _sse_event(status: str, message: str = "", data: Optional[Dict] = None) -> str:
-    """Format an SSE event."""
+    """Format an SSE event.
+
+    The payload is serialized with orjson and decoded back to str, since the
+    streaming response writes text frames.
+    """
     payload = {"status": status, "message": message}
     if data:
         payload["data"] = data
-    return f"data: {json.dumps(payload)}\n\n"
+    return f"data: {orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS).decode()}\n\n"
 
 
 def _parse_log_message(log: str, raw_mode: bool = False) -> Optional[str]:
@@ -448,6 +454,7 @@ def _validate_action_kind(action_kind: str, node_type: str) -> str:
     return action_kind
 
 
+@lru_cache(maxsize=1024)
 def _normalize_target_id(target_id: str) -> str:
     """Normalize malformed target_ids to correct format.
 
@@ -456,6 +463,8 @@ def _normalize_target_id(target_id: str) -> str:
     → python::deepdoc/parser/pdf_parser.py::RAGFlowPdfParser
 
     Returns the normalized target_id or original if normalization not needed.
+    Memoized: each drilldown normalizes every target_id twice (batch validation
+    and _format_node), and the same ids recur across drilldowns of a component.
     """
     if not target_id or not target_id.startswith("python::"):
         return target_id
@@ -590,6 +599,15 @@ def _validate_target_id(target_id: Optional[str], workspace_id: str, database_ur
         return None
 
 
+def _format_semantic_metadata(sm: SemanticMetadata) -> Dict[str, Any]:
+    """Convert SemanticMetadata to its API dict, converting Enums to strings.
+
+    JSON-mode model_dump emits enum values and keeps field order in a single
+    pydantic-core pass.
+    """
+    return sm.model_dump(mode="json")
+
+
 def _format_drilldown_response(response, workspace_id: str, cache_id: str, database_url: str | None = None) -> Dict:
     """Format component agent response as API dict.
 
@@ -607,43 +625,30 @@ def _format_drilldown_response(response, workspace_id: str, cache_id: str, datab
     target_ids = [n.action.target_id for n in response.next_layer.nodes]
     valid_target_ids = _batch_validate_target_ids(target_ids, workspace_id, database_url)
 
-    def _format_node(n):
+    def _format_node(n: NavigationNode) -> Dict[str, Any]:
         """Convert NavigationNode to API dict, including semantic metadata."""
+        action = n.action
         # Normalize and validate target_id
-        original_target_id = n.action.target_id
+        original_target_id = action.target_id
         normalized_target_id = _normalize_target_id(original_target_id) if original_target_id else None
         # Use normalized target_id if it exists in valid_target_ids, otherwise None
         target_id = normalized_target_id if normalized_target_id and normalized_target_id in valid_target_ids else None
 
-        node_dict = {
+        sm = n.semantic_metadata
+        # Semantic metadata and narrative are only emitted when present
+        return {
             "node_key": n.node_key,
             "title": n.title,
             "node_type": n.node_type,
             "description": n.description,
-            "action_kind": _validate_action_kind(n.action.kind, n.node_type),
+            "action_kind": _validate_action_kind(action.kind, n.node_type),
             "target_id": target_id,
-            "action_parameters": n.action.parameters,  # Preserve virtual node context
+            "action_parameters": action.parameters,  # Preserve virtual node context
             "sequence_order": n.sequence_order,
+            **({"semantic_metadata": _format_semantic_metadata(sm)} if sm is not None else {}),
+            **({"business_narrative": n.business_narrative} if n.business_narrative else {}),
         }
 
-        # Add semantic metadata if present, converting Enums to strings
-        if n.semantic_metadata:
-            node_dict["semantic_metadata"] = {
-                "semantic_role": n.semantic_metadata.semantic_role.value if n.semantic_metadata.semantic_role else None,
-                "business_context": n.semantic_metadata.business_context,
-                "business_significance": n.semantic_metadata.business_significance,
-                "flow_position": n.semantic_metadata.flow_position.value if n.semantic_metadata.flow_position else None,
-                "risk_level": n.semantic_metadata.risk_level.value if n.semantic_metadata.risk_level else None,
-                "dependencies_description": n.semantic_metadata.dependencies_description,
-                "impacted_workflows": n.semantic_metadata.impacted_workflows,
-            }
-
-        # Add business narrative if present
-        if n.business_narrative:
-            node_dict["business_narrative"] = n.business_narrative
-
-        return node_dict
-
     result = {
         "component_id": response.component_id,
         "agent_goal": response.agent_goal,
@@ -763,6 +768,21 @@ async def drilldown_stream(workspace_id: str, request: DrilldownRequest):
     )
 
 
+def _drilldown_json_response(data: Dict[str, Any]) -> Response:
+    """Validate a formatted drilldown payload and serialize it with pydantic-core.
+
+    Returning a Response directly skips FastAPI's second validate/encode pass
+    over the response model. An empty ``token_metrics`` dict maps to None, as
+    before, rather than to a zeroed TokenMetrics.
+    """
+    if not data.get("token_metrics"):
+        data = {**data, "token_metrics": None}
+    return Response(
+        content=DrilldownResponse.model_validate(data).model_dump_json(),
+        media_type="application/json",
+    )
+
+
 @router.post("/{workspace_id}/drilldown", response_model=DrilldownResponse)
 async def drilldown(workspace_id: str, request: DrilldownRequest):
     """Drill down into a component or node (non-streaming)."""
@@ -794,17 +814,8 @@ async def drilldown(workspace_id: str, request: DrilldownRequest):
     )
 
     if cached_response:
-        # Return cached response
-        return DrilldownResponse(
-            component_id=cached_response["component_id"],
-            agent_goal=cached_response["agent_goal"],
-            focus_label=cached_response["focus_label"],
-            rationale=cached_response["rationale"],
-            is_sequential=cached_response["is_sequential"],
-            nodes=[NavigationNodeDTO(**n) for n in cached_response["nodes"]],
-            cache_id=cached_response["cache_id"],
-            token_metrics=TokenMetrics(**cached_response["token_metrics"]) if cached_response.get("token_metrics") else None,
-        )
+        # Return cached response (validated in one pydantic-core pass, nested DTOs included)
+        return _drilldown_json_response(cached_response)
 
     try:
         drilldown_request, cache_id = _build_drilldown_request(
@@ -831,13 +842,4 @@ async def drilldown(workspace_id: str, request: DrilldownRequest):
         data,
     )
 
-    return DrilldownResponse(
-        component_id=data["component_id"],
-        agent_goal=data["agent_goal"],
-        focus_label=data["focus_label"],
-        rationale=data["rationale"],
-        is_sequential=data["is_sequential"],
-        nodes=[NavigationNodeDTO(**n) for n in data["nodes"]],
-        cache_id=data["cache_id"],
-        token_metrics=TokenMetrics(**data["token_metrics"]) if data.get("token_metrics") else None,
-    )
+    return _drilldown_json_response(data)
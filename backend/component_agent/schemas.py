@@ -91,6 +91,12 @@ class RiskLevel(str, Enum):
     LOW = "low"
 
 
+# Valid string values of the semantic enums, for O(1) membership checks
+SEMANTIC_ROLE_VALUES = frozenset(role.value for role in SemanticRole)
+BUSINESS_FLOW_POSITION_VALUES = frozenset(pos.value for pos in BusinessFlowPosition)
+RISK_LEVEL_VALUES = frozenset(level.value for level in RiskLevel)
+
+
 class SemanticMetadata(BaseModel):
     """Business semantic information extracted from code structure and context."""
     semantic_role: Optional[SemanticRole] = Field(
@@ -409,6 +415,9 @@ __all__ = [
     "SemanticRole",
     "BusinessFlowPosition",
     "RiskLevel",
+    "SEMANTIC_ROLE_VALUES",
+    "BUSINESS_FLOW_POSITION_VALUES",
+    "RISK_LEVEL_VALUES",
     "EvidenceItem",
     "SemanticMetadata",
     "NavigationAction",
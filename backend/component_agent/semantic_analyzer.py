@@ -4,9 +4,13 @@ This module provides utilities for analyzing code components and extracting
 semantic metadata that explains their business purpose, role, and significance.
 """
 
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 from component_agent.schemas import (
+    BUSINESS_FLOW_POSITION_VALUES,
+    RISK_LEVEL_VALUES,
+    SEMANTIC_ROLE_VALUES,
     BusinessFlowPosition,
     RiskLevel,
     SemanticMetadata,
@@ -188,6 +192,13 @@ EXTRACT semantic metadata:
 RESPOND ONLY with valid JSON containing these 7 fields."""
 
 
+_PATTERN_PROMPT_BUILDERS = {
+    "A": _build_pattern_a_semantic_prompt,
+    "B": _build_pattern_b_semantic_prompt,
+    "C": _build_pattern_c_semantic_prompt,
+}
+
+
 def build_semantic_extraction_prompt(
     pattern: str,
     component_name: str,
@@ -223,22 +234,27 @@ def build_semantic_extraction_prompt(
 
     pattern = pattern.upper() if pattern else ""
 
-    if pattern == "A":
-        return _build_pattern_a_semantic_prompt(
-            component_name, formatted_findings, context
-        )
-    elif pattern == "B":
-        return _build_pattern_b_semantic_prompt(
-            component_name, formatted_findings, context
-        )
-    elif pattern == "C":
-        return _build_pattern_c_semantic_prompt(
-            component_name, formatted_findings, context
-        )
-    else:
+    if pattern not in _PATTERN_PROMPT_BUILDERS:
         raise ValueError(
             f"Unknown pattern: {pattern}. Expected 'A', 'B', or 'C'"
         )
+    return _render_semantic_prompt(pattern, component_name, formatted_findings, context)
+
+
+@lru_cache(maxsize=256)
+def _render_semantic_prompt(
+    pattern: str,
+    component_name: str,
+    formatted_findings: str,
+    context: str,
+) -> str:
+    """Render (and memoize) the pattern-specific prompt.
+
+    Keyed on the already-formatted findings so repeat calls for the same
+    component return the identical string, which also keeps the prompt
+    prefix stable for provider-side prompt caching.
+    """
+    return _PATTERN_PROMPT_BUILDERS[pattern](component_name, formatted_findings, context)
 
 
 def parse_semantic_response(response: Dict[str, Any]) -> Optional[SemanticMetadata]:
@@ -254,30 +270,24 @@ def parse_semantic_response(response: Dict[str, Any]) -> Optional[SemanticMetada
         return None
 
     try:
-        # Convert string enums to actual enum values
+        # Convert string enums to actual enum values (unknown values are dropped)
         semantic_role = None
         if response.get("semantic_role"):
             role_str = response["semantic_role"].lower().replace(" ", "_")
-            try:
+            if role_str in SEMANTIC_ROLE_VALUES:
                 semantic_role = SemanticRole(role_str)
-            except ValueError:
-                pass
 
         flow_position = None
         if response.get("flow_position"):
             pos_str = response["flow_position"].lower().replace(" ", "_")
-            try:
+            if pos_str in BUSINESS_FLOW_POSITION_VALUES:
                 flow_position = BusinessFlowPosition(pos_str)
-            except ValueError:
-                pass
 
         risk_level = None
         if response.get("risk_level"):
             risk_str = response["risk_level"].lower()
-            try:
+            if risk_str in RISK_LEVEL_VALUES:
                 risk_level = RiskLevel(risk_str)
-            except ValueError:
-                pass
 
         # Handle impacted workflows
         workflows = response.get("impacted_workflows", [])
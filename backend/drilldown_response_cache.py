@@ -19,6 +19,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import TYPE_CHECKING, Optional
 
+import orjson
+
 if TYPE_CHECKING:
     from backend.component_agent.schemas import (
         ComponentDrilldownResponse,
@@ -109,8 +111,7 @@ class DrilldownResponseCache:
                             return None
 
             # Load and return cached response
-            with open(cache_file, "r") as f:
-                return json.load(f)
+            return orjson.loads(cache_file.read_bytes())
 
         except (json.JSONDecodeError, IOError) as e:
             # If cache is corrupted, silently return None
@@ -144,9 +145,10 @@ class DrilldownResponseCache:
         # Save response
         response_file = component_cache_dir / "response.json"
         try:
-            with open(response_file, "w") as f:
-                json.dump(response, f, indent=2)
-        except IOError as e:
+            response_file.write_bytes(
+                orjson.dumps(response, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            )
+        except (IOError, TypeError) as e:
             print(f"Warning: Failed to save cache to {response_file}: {e}")
             return
 
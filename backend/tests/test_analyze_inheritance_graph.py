@@ -0,0 +1,95 @@
+import networkx as nx
+import pytest
+
+from structural_scaffolding.database import persist_profiles
+from structural_scaffolding.models import Profile
+from tools.analyze_inheritance_graph import (
+    _find_base_class_candidates,
+    _find_classes_in_scope_from_db,
+    _get_implementation_ids,
+    _get_parent_ids,
+)
+from tools.graph_cache import clear_graph_cache
+
+BASE = "python::pkg/parsers/base.py::BaseParser"
+PDF = "python::pkg/parsers/pdf.py::PdfParser"
+DOCX = "python::pkg/parsers/docx.py::DocxParser"
+MIXIN = "python::pkg/parsers/mixins.py::LoggingMixin"
+OUTSIDE = "python::pkg/api/app.py::App"
+
+
+def _inheritance_graph():
+    graph = nx.MultiDiGraph()
+    graph.add_nodes_from([BASE, PDF, DOCX, MIXIN, OUTSIDE])
+    # INHERITS_FROM edges go child -> parent
+    graph.add_edge(PDF, BASE, type="INHERITS_FROM")
+    graph.add_edge(PDF, BASE, type="INHERITS_FROM")  # parallel duplicate
+    graph.add_edge(DOCX, BASE, type="INHERITS_FROM")
+    graph.add_edge(PDF, MIXIN, type="INHERITS_FROM")
+    graph.add_edge(OUTSIDE, BASE, type="CALLS")
+    return graph
+
+
+def test_find_base_class_candidates_counts_inherits_from_edges():
+    counts = _find_base_class_candidates(_inheritance_graph(), [BASE, PDF, MIXIN, "python::missing::Gone"])
+
+    assert dict(counts) == {BASE: 3, MIXIN: 1}
+
+
+def test_find_base_class_candidates_empty_scope():
+    assert not _find_base_class_candidates(_inheritance_graph(), [])
+
+
+def test_implementation_and_parent_ids_are_deduplicated():
+    graph = _inheritance_graph()
+
+    assert _get_implementation_ids(graph, BASE) == [PDF, DOCX]
+    assert _get_parent_ids(graph, PDF) == [BASE, MIXIN]
+    assert _get_parent_ids(graph, OUTSIDE) == []
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'profiles.db'}"
+
+    def class_profile(node_id, file_path):
+        return Profile(
+            id=node_id,
+            kind="class",
+            file_path=file_path,
+            function_name=None,
+            class_name=node_id.rsplit("::", 1)[-1],
+            start_line=1,
+            end_line=2,
+            source_code="class X:\n    pass\n",
+        )
+
+    persist_profiles(
+        [
+            class_profile(BASE, "pkg/parsers/base.py"),
+            class_profile(PDF, "pkg/parsers/pdf.py"),
+            class_profile(OUTSIDE, "pkg/api/app.py"),
+            Profile(
+                id=f"{PDF}::parse",
+                kind="method",
+                file_path="pkg/parsers/pdf.py",
+                function_name="parse",
+                class_name="PdfParser",
+                start_line=3,
+                end_line=4,
+                source_code="def parse(self):\n    pass\n",
+            ),
+        ],
+        workspace_id="ws",
+        database_url=url,
+    )
+    clear_graph_cache()
+    yield url
+    clear_graph_cache()
+
+
+def test_find_classes_in_scope_from_db_filters_kind_and_path(database_url):
+    classes = _find_classes_in_scope_from_db("ws", database_url, "pkg/parsers")
+
+    assert sorted(classes) == sorted([BASE, PDF])
+    assert _find_classes_in_scope_from_db("other", database_url, "pkg/parsers") == ()
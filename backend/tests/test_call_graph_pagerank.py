@@ -0,0 +1,90 @@
+import networkx as nx
+import pytest
+
+from tools import call_graph_pagerank
+from tools.call_graph_pagerank import _compute_pagerank
+from tools.graph_queries import build_call_edge_graph
+
+CATEGORIES = {
+    "api": "controller",
+    "service": "service",
+    "helper": "utility",
+    "model": "model",
+    "test_api": "test",
+}
+
+# Scores of the original dict-based implementation on _make_graph(CATEGORIES)
+BASELINE_SCORES = {
+    "api": 0.30689,
+    "service": 0.413176,
+    "helper": 0.030793,
+    "model": 0.249142,
+}
+
+
+def _make_graph(categories):
+    graph = nx.MultiDiGraph()
+    for node, category in categories.items():
+        graph.add_node(node, category=category, label=node.upper())
+    graph.add_edge("api", "service", type="CALLS", weight=2.0)
+    graph.add_edge("api", "service", type="CALLS", weight=1.0)
+    graph.add_edge("api", "helper", type="CALLS")
+    graph.add_edge("service", "model", type="CALLS", weight=3.0)
+    graph.add_edge("service", "helper", type="CALLS", weight=1.0)
+    # helper only has a zero-weight call and model no outgoing call: both dangling
+    graph.add_edge("helper", "model", type="CALLS", weight=0.0)
+    graph.add_edge("model", "api", type="IMPORTS")
+    graph.add_edge("test_api", "api", type="CALLS", weight=1.0)
+    return graph
+
+
+@pytest.fixture(params=["python", "sparse"])
+def kernel(request, monkeypatch):
+    if request.param == "sparse":
+        pytest.importorskip("scipy")
+        assert call_graph_pagerank.sparse is not None
+    else:
+        monkeypatch.setattr(call_graph_pagerank, "sparse", None)
+    return request.param
+
+
+def test_pagerank_matches_baseline_scores(kernel):
+    scores = _compute_pagerank(_make_graph(CATEGORIES))
+
+    assert scores == pytest.approx(BASELINE_SCORES, abs=1e-6)
+
+
+def test_pagerank_matches_networkx_reference(kernel):
+    graph = _make_graph(dict.fromkeys(CATEGORIES, "unknown"))
+    reference = nx.pagerank(build_call_edge_graph(graph), alpha=0.85, weight="weight", tol=1e-12, max_iter=1000)
+
+    scores = _compute_pagerank(graph)
+
+    assert scores == pytest.approx(reference, abs=1e-6)
+
+
+def test_pagerank_all_zero_multipliers_returns_base_scores(kernel):
+    graph = _make_graph(dict.fromkeys(CATEGORIES, "test"))
+    reference = nx.pagerank(build_call_edge_graph(graph), alpha=0.85, weight="weight", tol=1e-12, max_iter=1000)
+
+    scores = _compute_pagerank(graph)
+
+    assert set(scores) == set(CATEGORIES)
+    assert sum(scores.values()) == pytest.approx(1.0)
+    assert scores == pytest.approx(reference, abs=1e-6)
+
+
+def test_pagerank_kernels_agree():
+    pytest.importorskip("scipy")
+    graph = _make_graph(CATEGORIES)
+    sparse_scores = _compute_pagerank(graph)
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(call_graph_pagerank, "sparse", None)
+        python_scores = _compute_pagerank(graph)
+
+    assert sparse_scores == pytest.approx(python_scores, abs=1e-9)
+
+
+def test_pagerank_empty_graph():
+    assert _compute_pagerank(nx.MultiDiGraph()) == {}
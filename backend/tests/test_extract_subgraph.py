@@ -0,0 +1,137 @@
+import networkx as nx
+import pytest
+
+from structural_scaffolding.database import create_session, persist_profiles
+from structural_scaffolding.models import Profile
+from tools.extract_subgraph import (
+    _bfs_expand,
+    _build_node_payload,
+    _load_node_summaries,
+    _query_node_summaries,
+)
+from tools.graph_cache import clear_graph_cache
+
+WORKSPACE = "ws"
+SERVICE_ID = "python::app/service.py::Service::run"
+HELPER_ID = "python::app/util.py::helper"
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'profiles.db'}"
+    persist_profiles(
+        [
+            Profile(
+                id=SERVICE_ID,
+                kind="method",
+                file_path="app/service.py",
+                function_name="run",
+                class_name="Service",
+                start_line=10,
+                end_line=20,
+                source_code="def run(self, job):\n    return job\n",
+                docstring="  Run one job.  ",
+                parameters=["self", "job"],
+            ),
+            Profile(
+                id=HELPER_ID,
+                kind="function",
+                file_path="app/util.py",
+                function_name="helper",
+                class_name=None,
+                start_line=1,
+                end_line=3,
+                source_code="def helper():\n    pass\n",
+            ),
+        ],
+        workspace_id=WORKSPACE,
+        database_url=url,
+    )
+    clear_graph_cache()
+    yield url
+    clear_graph_cache()
+
+
+def test_query_node_summaries_reads_profiles(database_url):
+    session = create_session(database_url)
+    try:
+        summaries = _query_node_summaries(session, [SERVICE_ID, HELPER_ID, "python::missing"], WORKSPACE, False)
+    finally:
+        session.close()
+
+    assert set(summaries) == {SERVICE_ID, HELPER_ID}
+    service = summaries[SERVICE_ID]
+    assert service["docstring"] == "Run one job."
+    assert service["line_range"] == "10-20"
+    assert service["parameters"] == ["self", "job"]
+    assert "source_snippet" not in service
+    assert "docstring" not in summaries[HELPER_ID]
+    assert summaries[HELPER_ID]["inferred_summary"]
+
+
+def test_query_node_summaries_includes_source_on_request(database_url):
+    session = create_session(database_url)
+    try:
+        summaries = _query_node_summaries(session, [SERVICE_ID], WORKSPACE, True)
+    finally:
+        session.close()
+
+    assert summaries[SERVICE_ID]["source_snippet"] == "def run(self, job):\n    return job"
+
+
+def test_cached_summaries_are_not_aliased_by_payloads(database_url):
+    summaries = _load_node_summaries(frozenset({SERVICE_ID}), WORKSPACE, database_url, False)
+    payload = _build_node_payload(SERVICE_ID, {}, SERVICE_ID, summaries[SERVICE_ID], "implementation")
+    payload["parameters"].append("extra")
+
+    with pytest.raises(TypeError):
+        summaries[SERVICE_ID]["docstring"] = "changed"
+
+    again = _load_node_summaries(frozenset({SERVICE_ID}), WORKSPACE, database_url, False)
+    assert again is summaries
+    assert again[SERVICE_ID]["parameters"] == ["self", "job"]
+
+
+def test_clear_graph_cache_drops_cached_summaries(database_url):
+    _load_node_summaries(frozenset({SERVICE_ID}), WORKSPACE, database_url, False)
+    assert _load_node_summaries.cache_info().currsize == 1
+
+    clear_graph_cache()
+
+    assert _load_node_summaries.cache_info().currsize == 0
+
+
+def _call_graph():
+    graph = nx.MultiDiGraph()
+    for node in "abcde":
+        graph.add_node(node, label=node.upper())
+    graph.add_edge("a", "b", type="CALLS")
+    graph.add_edge("a", "b", type="IMPORTS")
+    graph.add_edge("b", "c")  # untyped edges default to CALLS
+    graph.add_edge("d", "a", type="CALLS")
+    graph.add_edge("c", "e", type="CALLS")
+    return graph
+
+
+def test_bfs_expand_walks_both_directions_to_max_depth():
+    nodes, edges = _bfs_expand(_call_graph(), "a", max_depth=2, max_nodes=10)
+
+    assert list(nodes) == ["a", "b", "d", "c"]
+    assert nodes["b"] == {"label": "B"}
+    assert edges == [
+        ("a", "b", "CALLS"),
+        ("a", "b", "IMPORTS"),
+        ("d", "a", "CALLS"),
+        ("b", "c", "CALLS"),
+    ]
+
+
+def test_bfs_expand_stops_at_max_nodes_without_dangling_edges():
+    nodes, edges = _bfs_expand(_call_graph(), "a", max_depth=3, max_nodes=2)
+
+    assert list(nodes) == ["a", "b"]
+    assert edges == [("a", "b", "CALLS"), ("a", "b", "IMPORTS")]
+
+
+def test_bfs_expand_missing_anchor():
+    assert _bfs_expand(_call_graph(), "missing", max_depth=2, max_nodes=10) == ({}, [])
@@ -0,0 +1,82 @@
+import networkx as nx
+import pytest
+
+from tools import graph_queries
+from tools.graph_cache import clear_graph_cache, save_graph
+from tools.graph_queries import (
+    get_call_projection,
+    get_edges_by_type,
+    get_graph,
+    get_node_categories,
+    node_snapshots,
+)
+
+WORKSPACE = "ws"
+
+
+def _graph(*extra_nodes):
+    graph = nx.MultiDiGraph()
+    graph.add_node("a", category="service", label="A")
+    graph.add_node("b", kind="function", label="B")
+    graph.add_edge("a", "b", type="CALLS", weight=2.0)
+    graph.add_edge("b", "a", type="IMPORTS")
+    for node in extra_nodes:
+        graph.add_node(node, category="model")
+        graph.add_edge("a", node, type="CALLS")
+    return graph
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    clear_graph_cache()
+    yield f"sqlite:///{tmp_path / 'graphs.db'}"
+    clear_graph_cache()
+
+
+def test_derived_values_are_built_once_per_graph(database_url):
+    save_graph(WORKSPACE, _graph(), database_url)
+    graph = get_graph(WORKSPACE, database_url)
+
+    assert get_node_categories(graph) == {"a": "service", "b": "function"}
+    assert get_node_categories(graph) is get_node_categories(graph)
+    assert get_call_projection(graph) is get_call_projection(graph)
+    assert [(s, t) for s, t, _ in get_edges_by_type(graph)["CALLS"]] == [("a", "b")]
+    assert get_call_projection(graph)["a"]["b"]["weight"] == 2.0
+    assert not get_call_projection(graph).has_edge("b", "a")
+
+
+def test_saving_a_graph_invalidates_derived_values(database_url):
+    save_graph(WORKSPACE, _graph(), database_url)
+    old_graph = get_graph(WORKSPACE, database_url)
+    old_categories = get_node_categories(old_graph)
+    assert old_graph in graph_queries._DERIVED_CACHE
+
+    # save_graph runs clear_graph_cache(), which runs every registered clear hook
+    save_graph(WORKSPACE, _graph("c"), database_url)
+    assert old_graph not in graph_queries._DERIVED_CACHE
+
+    new_graph = get_graph(WORKSPACE, database_url)
+    assert new_graph is not old_graph
+    categories = get_node_categories(new_graph)
+    assert categories is not old_categories
+    assert categories["c"] == "model"
+    assert get_call_projection(new_graph).has_edge("a", "c")
+
+
+def test_derived_values_follow_the_graph_object_not_the_workspace():
+    first, second = _graph(), _graph("c")
+
+    assert "c" not in get_node_categories(first)
+    assert get_node_categories(second)["c"] == "model"
+
+
+def test_node_snapshots_are_cached_but_returned_as_copies():
+    graph = _graph()
+    first = node_snapshots(graph, ["a", "b"])
+    first[0]["label"] = "changed"
+
+    second = node_snapshots(graph, ["a"])
+    assert second[0] == {"id": "a", "label": "A", "kind": None, "category": "service", "file_path": None}
+
+    with pytest.raises(KeyError):
+        node_snapshots(graph, ["missing"])
@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+
+from tools import list_core_models
+from tools.list_core_models import _profile_to_schema
+
+SOURCE = """class Author(Model):
+    name = peewee.CharField(max_length=64)
+    email = CharField(unique=True)
+
+    class Meta:
+        table_name = "authors"
+"""
+
+
+def _record(source=SOURCE):
+    return SimpleNamespace(
+        id="app/models.py::Author",
+        class_name="Author",
+        file_path="app/models.py",
+        start_line=10,
+        end_line=15,
+        source_code=source,
+        data={"qualified_name": "app.models.Author"},
+    )
+
+
+def test_profile_schema_extracts_fields_and_meta():
+    schema = _profile_to_schema(_record())
+
+    assert schema["model_name"] == "Author"
+    assert schema["qualified_name"] == "app.models.Author"
+    assert schema["bases"] == ["Model"]
+    assert schema["meta"] == {"table_name": "authors"}
+    assert [(f["name"], f["qualified_type"], f["line"]) for f in schema["fields"]] == [
+        ("name", "peewee.CharField", 11),
+        ("email", "CharField", 12),
+    ]
+    assert schema["fields"][0]["kwargs"] == {"max_length": 64}
+
+
+def test_profile_schema_is_cached_per_record():
+    first = _profile_to_schema(_record())
+
+    assert _profile_to_schema(_record()) is first
+
+
+def test_profile_schema_cache_is_keyed_on_source_digest():
+    list_core_models._cached_schema.cache_clear()
+    _profile_to_schema(_record())
+    changed = _profile_to_schema(_record(SOURCE.replace("email", "contact")))
+
+    assert [f["name"] for f in changed["fields"]] == ["name", "contact"]
+    assert list_core_models._cached_schema.cache_info().currsize == 2
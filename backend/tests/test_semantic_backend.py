@@ -5,7 +5,12 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from enum import Enum
-from typing import Optional, List
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Sequence, Tuple
+
+import orjson
+
+from api.routes.workspaces import _sse_event
 
 
 # === Minimal Enum Definitions (matching backend) ===
@@ -44,16 +49,39 @@ class RiskLevel(str, Enum):
     LOW = "low"
 
 
+# Enum value sets, built once at import instead of per test
+SEMANTIC_ROLE_VALUES = frozenset(role.value for role in SemanticRole)
+BUSINESS_FLOW_POSITION_VALUES = frozenset(pos.value for pos in BusinessFlowPosition)
+RISK_LEVEL_VALUES = frozenset(level.value for level in RiskLevel)
+
+
+# Shared read-only defaults so metadata-free nodes don't allocate empty containers
+_EMPTY_PARAMS = MappingProxyType({})
+_EMPTY_WORKFLOWS: Tuple[str, ...] = ()
+
+
 class Action:
     """Minimal action class."""
-    def __init__(self, kind: str, target_id: Optional[str] = None, parameters: Optional[dict] = None):
+    __slots__ = ("kind", "target_id", "parameters")
+
+    def __init__(self, kind: str, target_id: Optional[str] = None, parameters: Mapping = _EMPTY_PARAMS):
         self.kind = kind
         self.target_id = target_id
-        self.parameters = parameters or {}
+        self.parameters = parameters
 
 
 class SemanticMetadata:
     """Minimal semantic metadata class."""
+    __slots__ = (
+        "semantic_role",
+        "business_context",
+        "business_significance",
+        "flow_position",
+        "risk_level",
+        "dependencies_description",
+        "impacted_workflows",
+    )
+
     def __init__(
         self,
         semantic_role: Optional[SemanticRole] = None,
@@ -62,7 +90,7 @@ class SemanticMetadata:
         flow_position: Optional[BusinessFlowPosition] = None,
         risk_level: Optional[RiskLevel] = None,
         dependencies_description: Optional[str] = None,
-        impacted_workflows: Optional[List[str]] = None,
+        impacted_workflows: Sequence[str] = _EMPTY_WORKFLOWS,
     ):
         self.semantic_role = semantic_role
         self.business_context = business_context
@@ -70,11 +98,24 @@ class SemanticMetadata:
         self.flow_position = flow_position
         self.risk_level = risk_level
         self.dependencies_description = dependencies_description
-        self.impacted_workflows = impacted_workflows or []
+        # Stored as a tuple: never mutated, no over-allocation, encodes as a JSON array
+        self.impacted_workflows = tuple(impacted_workflows)
 
 
 class NavigationNode:
     """Minimal navigation node matching backend schema."""
+    __slots__ = (
+        "node_key",
+        "title",
+        "node_type",
+        "description",
+        "action",
+        "semantic_metadata",
+        "business_narrative",
+        "sequence_order",
+        "target_id",
+    )
+
     def __init__(
         self,
         node_key: str,
@@ -100,37 +141,55 @@ class NavigationNode:
 
 # === DTO Conversion Logic (matching workspaces.py) ===
 
+# Skeleton for the semantic_metadata sub-dict; copied per node so the key
+# order is fixed and unset enum fields stay None without an explicit insert.
+_EMPTY_SEMANTIC_METADATA: dict = dict.fromkeys(
+    (
+        "semantic_role",
+        "business_context",
+        "business_significance",
+        "flow_position",
+        "risk_level",
+        "dependencies_description",
+        "impacted_workflows",
+    ),
+    None,
+)
+
+
+def _format_semantic_metadata(sm: SemanticMetadata) -> dict:
+    """Convert SemanticMetadata to its API dict, converting Enums to strings."""
+    semantic = _EMPTY_SEMANTIC_METADATA.copy()
+    if sm.semantic_role:
+        semantic["semantic_role"] = sm.semantic_role.value
+    semantic["business_context"] = sm.business_context
+    semantic["business_significance"] = sm.business_significance
+    if sm.flow_position:
+        semantic["flow_position"] = sm.flow_position.value
+    if sm.risk_level:
+        semantic["risk_level"] = sm.risk_level.value
+    semantic["dependencies_description"] = sm.dependencies_description
+    semantic["impacted_workflows"] = list(sm.impacted_workflows)
+    return semantic
+
+
 def _format_node(n: NavigationNode, workspace_id: str = "test-workspace", database_url: Optional[str] = None) -> dict:
     """Convert NavigationNode to API dict, including semantic metadata."""
-    node_dict = {
+    action = n.action
+    # Semantic metadata and narrative are only emitted when present
+    return {
         "node_key": n.node_key,
         "title": n.title,
         "node_type": n.node_type,
         "description": n.description,
-        "action_kind": n.action.kind,
-        "target_id": n.action.target_id,
-        "action_parameters": n.action.parameters,
+        "action_kind": action.kind,
+        "target_id": action.target_id,
+        "action_parameters": action.parameters if action.parameters else {},
         "sequence_order": n.sequence_order,
+        **({"semantic_metadata": _format_semantic_metadata(n.semantic_metadata)} if n.semantic_metadata else {}),
+        **({"business_narrative": n.business_narrative} if n.business_narrative else {}),
     }
 
-    # Add semantic metadata if present, converting Enums to strings
-    if n.semantic_metadata:
-        node_dict["semantic_metadata"] = {
-            "semantic_role": n.semantic_metadata.semantic_role.value if n.semantic_metadata.semantic_role else None,
-            "business_context": n.semantic_metadata.business_context,
-            "business_significance": n.semantic_metadata.business_significance,
-            "flow_position": n.semantic_metadata.flow_position.value if n.semantic_metadata.flow_position else None,
-            "risk_level": n.semantic_metadata.risk_level.value if n.semantic_metadata.risk_level else None,
-            "dependencies_description": n.semantic_metadata.dependencies_description,
-            "impacted_workflows": n.semantic_metadata.impacted_workflows,
-        }
-
-    # Add business narrative if present
-    if n.business_narrative:
-        node_dict["business_narrative"] = n.business_narrative
-
-    return node_dict
-
 
 # === Test Suite ===
 
@@ -141,8 +200,7 @@ def test_semantic_role_enum_values():
         "repository", "factory", "adapter", "mediator", "aggregator",
         "dispatcher", "strategy", "sink"
     }
-    actual_roles = {role.value for role in SemanticRole}
-    assert actual_roles == expected_roles, f"Missing roles: {expected_roles - actual_roles}"
+    assert SEMANTIC_ROLE_VALUES == expected_roles, f"Missing roles: {expected_roles - SEMANTIC_ROLE_VALUES}"
     print("✓ SemanticRole enum has all 13 values")
 
 
@@ -152,16 +210,16 @@ def test_business_flow_position_enum_values():
         "entry_point", "validation", "processing", "transformation",
         "aggregation", "storage", "output", "error_handling"
     }
-    actual_positions = {pos.value for pos in BusinessFlowPosition}
-    assert actual_positions == expected_positions, f"Missing positions: {expected_positions - actual_positions}"
+    assert BUSINESS_FLOW_POSITION_VALUES == expected_positions, (
+        f"Missing positions: {expected_positions - BUSINESS_FLOW_POSITION_VALUES}"
+    )
     print("✓ BusinessFlowPosition enum has all 8 values")
 
 
 def test_risk_level_enum_values():
     """Verify RiskLevel enum has all 4 values."""
     expected_levels = {"critical", "high", "medium", "low"}
-    actual_levels = {level.value for level in RiskLevel}
-    assert actual_levels == expected_levels, f"Missing levels: {expected_levels - actual_levels}"
+    assert RISK_LEVEL_VALUES == expected_levels, f"Missing levels: {expected_levels - RISK_LEVEL_VALUES}"
     print("✓ RiskLevel enum has all 4 values")
 
 
@@ -318,22 +376,23 @@ def test_enum_none_check():
     print("✓ Enum None check works correctly")
 
 
+def _is_lowercase_value(value) -> bool:
+    """Single-pass check for a non-empty lowercase str value (exact type, str-Enums store plain str)."""
+    return type(value) is str and value != "" and value == value.lower()
+
+
 def test_all_semantic_roles_are_strings():
     """Verify all SemanticRole values are valid strings."""
-    for role in SemanticRole:
-        assert isinstance(role.value, str), f"Role {role} value is not string: {role.value}"
-        assert len(role.value) > 0, f"Role {role} has empty value"
-        assert role.value.islower(), f"Role {role} value is not lowercase: {role.value}"
+    bad = [r for r in SemanticRole if not _is_lowercase_value(r.value)]
+    assert not bad, f"Invalid semantic roles: {bad}"
 
     print("✓ All semantic roles are valid lowercase strings")
 
 
 def test_all_flow_positions_are_strings():
     """Verify all BusinessFlowPosition values are valid strings."""
-    for position in BusinessFlowPosition:
-        assert isinstance(position.value, str), f"Position {position} value is not string"
-        assert len(position.value) > 0, f"Position {position} has empty value"
-        assert position.value.islower(), f"Position {position} value is not lowercase"
+    bad = [p for p in BusinessFlowPosition if not _is_lowercase_value(p.value)]
+    assert not bad, f"Invalid flow positions: {bad}"
 
     print("✓ All flow positions are valid lowercase strings")
 
@@ -461,6 +520,67 @@ def test_multiple_nodes_conversion():
     print("✓ Multiple nodes conversion works correctly")
 
 
+def _sse_data(frame: str):
+    """Decode the JSON body of a single SSE frame."""
+    assert frame.startswith("data: ") and frame.endswith("\n\n")
+    return orjson.loads(frame[len("data: "):])
+
+
+def test_sse_event_encodes_node():
+    """Test that the SSE event carries the same payload as the dict conversion."""
+    node = NavigationNode(
+        node_key="api-gateway",
+        title="API Gateway",
+        node_type="class",
+        description="Main API entry point",
+        action=Action(kind="component_drilldown", parameters={"virtual": True}),
+        semantic_metadata=SemanticMetadata(
+            semantic_role=SemanticRole.GATEWAY,
+            flow_position=BusinessFlowPosition.ENTRY_POINT,
+            risk_level=RiskLevel.CRITICAL,
+            impacted_workflows=["user_auth"],
+        ),
+        business_narrative="Entry point for all requests.",
+    )
+
+    frame = _sse_event("complete", data={"node": _format_node(node)})
+
+    assert isinstance(frame, str)
+    payload = _sse_data(frame)
+    assert payload["status"] == "complete"
+    restored = payload["data"]["node"]
+    assert restored == _format_node(node)
+    assert restored["semantic_metadata"]["semantic_role"] == "gateway"
+    assert restored["semantic_metadata"]["risk_level"] == "critical"
+
+    print("✓ SSE event serialization matches dict conversion")
+
+
+def test_sse_event_encodes_node_layer():
+    """Test that a layer of nodes encodes to one SSE event and round-trips."""
+    nodes = [
+        NavigationNode(
+            node_key=f"node-{i}",
+            title=f"Node {i}",
+            node_type="class",
+            description=f"Node description {i}",
+            action=Action(kind="component_drilldown"),
+            semantic_metadata=SemanticMetadata(semantic_role=SemanticRole.PROCESSOR) if i % 2 == 0 else None,
+            sequence_order=i,
+        )
+        for i in range(50)
+    ]
+
+    frame = _sse_event("complete", data={"nodes": [_format_node(node) for node in nodes]})
+
+    restored = _sse_data(frame)["data"]["nodes"]
+    assert restored == [_format_node(node) for node in nodes]
+    assert restored[0]["semantic_metadata"]["semantic_role"] == "processor"
+    assert "semantic_metadata" not in restored[1]
+
+    print("✓ Bulk node encoding round-trips correctly")
+
+
 # === Run All Tests ===
 
 def run_all_tests():
@@ -482,6 +602,8 @@ def run_all_tests():
         test_action_parameters_preservation,
         test_sequence_order_handling,
         test_multiple_nodes_conversion,
+        test_sse_event_encodes_node,
+        test_sse_event_encodes_node_layer,
     ]
 
     print("=" * 70)
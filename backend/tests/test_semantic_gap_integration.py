@@ -7,128 +7,211 @@ This test suite verifies that semantic metadata flows correctly through:
 4. Frontend type definitions (NavigationNode with semantic_metadata)
 """
 
+from types import SimpleNamespace
+
+import orjson
 import pytest
-from component_agent.schemas import (
-    NavigationNode,
-    NavigationAction,
-    SemanticMetadata,
-    SemanticRole,
-    BusinessFlowPosition,
-    RiskLevel,
-)
-from component_agent.semantic_analyzer import (
-    build_semantic_extraction_prompt,
-    format_structural_findings,
-    parse_semantic_response,
-)
-from api.schemas import NavigationNodeDTO, SemanticMetadataDTO
+
+
+@pytest.fixture(scope="module")
+def schemas():
+    """Import the pydantic schemas and analyzer on first use rather than at collection."""
+    from component_agent.schemas import (
+        NavigationNode,
+        NavigationAction,
+        SemanticMetadata,
+        SemanticRole,
+        BusinessFlowPosition,
+        RiskLevel,
+        SEMANTIC_ROLE_VALUES,
+        BUSINESS_FLOW_POSITION_VALUES,
+        RISK_LEVEL_VALUES,
+    )
+    from component_agent.semantic_analyzer import (
+        build_semantic_extraction_prompt,
+        format_structural_findings,
+        parse_semantic_response,
+    )
+    from api.schemas import NavigationNodeDTO, SemanticMetadataDTO
+
+    return SimpleNamespace(
+        NavigationNode=NavigationNode,
+        NavigationAction=NavigationAction,
+        SemanticMetadata=SemanticMetadata,
+        SemanticRole=SemanticRole,
+        BusinessFlowPosition=BusinessFlowPosition,
+        RiskLevel=RiskLevel,
+        SEMANTIC_ROLE_VALUES=SEMANTIC_ROLE_VALUES,
+        BUSINESS_FLOW_POSITION_VALUES=BUSINESS_FLOW_POSITION_VALUES,
+        RISK_LEVEL_VALUES=RISK_LEVEL_VALUES,
+        build_semantic_extraction_prompt=build_semantic_extraction_prompt,
+        format_structural_findings=format_structural_findings,
+        parse_semantic_response=parse_semantic_response,
+        NavigationNodeDTO=NavigationNodeDTO,
+        SemanticMetadataDTO=SemanticMetadataDTO,
+    )
+
+EXPECTED_SEMANTIC_ROLES = frozenset({
+    "gateway",
+    "processor",
+    "sink",
+    "orchestrator",
+    "validator",
+    "transformer",
+    "aggregator",
+    "dispatcher",
+    "adapter",
+    "mediator",
+    "repository",
+    "factory",
+    "strategy",
+})
+EXPECTED_FLOW_POSITIONS = frozenset({
+    "entry_point",
+    "validation",
+    "processing",
+    "transformation",
+    "aggregation",
+    "storage",
+    "output",
+    "error_handling",
+})
+EXPECTED_RISK_LEVELS = frozenset({"critical", "high", "medium", "low"})
+
+
+@pytest.fixture(scope="module")
+def gateway_metadata(schemas):
+    """Fully populated gateway metadata, validated once for the module."""
+    return schemas.SemanticMetadata(
+        semantic_role=schemas.SemanticRole.GATEWAY,
+        business_context="Entry point for external API requests",
+        business_significance="Critical for user access",
+        flow_position=schemas.BusinessFlowPosition.ENTRY_POINT,
+        risk_level=schemas.RiskLevel.CRITICAL,
+        dependencies_description="Load balancer, authentication service",
+        impacted_workflows=["user_auth", "data_ingestion"],
+    )
 
 
 class TestSemanticMetadataEnd2End:
     """Test semantic metadata through entire system."""
 
-    def test_semantic_metadata_schema_validation_full_fields(self):
+    def test_semantic_metadata_schema_validation_full_fields(self, schemas, gateway_metadata):
         """SemanticMetadata should validate all semantic fields."""
-        metadata = SemanticMetadata(
-            semantic_role=SemanticRole.GATEWAY,
-            business_context="Entry point for external API requests",
-            business_significance="Critical for user access",
-            flow_position=BusinessFlowPosition.ENTRY_POINT,
-            risk_level=RiskLevel.CRITICAL,
-            dependencies_description="Load balancer, authentication service",
-            impacted_workflows=["user_auth", "data_ingestion"],
-        )
+        metadata = gateway_metadata
 
-        assert metadata.semantic_role == SemanticRole.GATEWAY
-        assert metadata.flow_position == BusinessFlowPosition.ENTRY_POINT
-        assert metadata.risk_level == RiskLevel.CRITICAL
+        assert metadata.semantic_role == schemas.SemanticRole.GATEWAY
+        assert metadata.flow_position == schemas.BusinessFlowPosition.ENTRY_POINT
+        assert metadata.risk_level == schemas.RiskLevel.CRITICAL
         assert len(metadata.impacted_workflows) == 2
 
-    def test_navigation_node_with_semantic_metadata_required(self):
+    def test_navigation_node_with_semantic_metadata_required(self, schemas, gateway_metadata):
         """NavigationNode must accept semantic_metadata as optional field."""
-        semantic_meta = SemanticMetadata(
-            semantic_role=SemanticRole.PROCESSOR,
-            business_context="Processes uploaded documents",
-            risk_level=RiskLevel.HIGH,
-            impacted_workflows=["document_processing"],
+        # Shallow model_copy does not re-validate; only the updated fields change
+        semantic_meta = gateway_metadata.model_copy(
+            update={
+                "semantic_role": schemas.SemanticRole.PROCESSOR,
+                "business_context": "Processes uploaded documents",
+                "risk_level": schemas.RiskLevel.HIGH,
+                "impacted_workflows": ["document_processing"],
+            }
         )
 
-        node = NavigationNode(
+        node = schemas.NavigationNode(
             node_key="doc-processor",
             title="Document Processor",
             node_type="class",
             description="Handles document input processing",
-            action=NavigationAction(kind="component_drilldown", target_id="proc-123"),
+            action=schemas.NavigationAction(kind="component_drilldown", target_id="proc-123"),
             semantic_metadata=semantic_meta,
             business_narrative="The Document Processor validates and parses incoming documents before analysis.",
         )
 
         assert node.semantic_metadata is not None
-        assert node.semantic_metadata.semantic_role == SemanticRole.PROCESSOR
+        assert node.semantic_metadata.semantic_role == schemas.SemanticRole.PROCESSOR
         assert node.business_narrative is not None
         assert "Parser" not in node.business_narrative  # Not technical jargon
         assert "validates" in node.business_narrative.lower()  # Business action
 
-    def test_semantic_analyzer_prompt_generation_pattern_a(self):
-        """Semantic analyzer should generate Pattern A (Registry) prompts."""
-        findings = {
-            "class_names": ["BaseParser", "PDFParser", "WordParser"],
-            "public_methods": ["parse", "validate"],
-            "dependencies": ["file_handler", "validator"],
-            "inheritance": "BaseParser -> {PDFParser, WordParser}",
-        }
-
-        prompt = build_semantic_extraction_prompt(
-            pattern="A",
-            component_name="ParserRegistry",
+    @pytest.mark.parametrize(
+        "pattern, component_name, findings, required_fields, any_terms",
+        [
+            pytest.param(
+                "A",
+                "ParserRegistry",
+                {
+                    "class_names": ["BaseParser", "PDFParser", "WordParser"],
+                    "public_methods": ["parse", "validate"],
+                    "dependencies": ["file_handler", "validator"],
+                    "inheritance": "BaseParser -> {PDFParser, WordParser}",
+                },
+                ("semantic_role", "business_context", "risk_level", "impacted_workflows"),
+                ("factory", "registry"),
+                id="pattern_a_registry",
+            ),
+            pytest.param(
+                "B",
+                "WorkflowEngine",
+                {
+                    "class_names": ["Orchestrator", "Validator", "Processor"],
+                    "public_methods": ["execute", "validate", "process"],
+                    "dependencies": [],
+                    "inheritance": "None",
+                },
+                ("business_context", "flow_position"),
+                ("orchestrator", "orchestration"),
+                id="pattern_b_workflow",
+            ),
+            pytest.param(
+                "C",
+                "RestAPI",
+                {
+                    "class_names": ["APIGateway", "AuthHandler", "DataService"],
+                    "public_methods": ["POST", "GET", "DELETE"],
+                    "dependencies": ["database", "auth_service"],
+                    "inheritance": "APIGateway -> {AuthHandler, DataService}",
+                },
+                ("business_context", "risk_level"),
+                ("gateway", "api"),
+                id="pattern_c_api_service",
+            ),
+        ],
+    )
+    def test_semantic_analyzer_prompt_generation(
+        self, schemas, pattern, component_name, findings, required_fields, any_terms
+    ):
+        """Semantic analyzer should generate pattern-specific prompts (A/B/C)."""
+        prompt = schemas.build_semantic_extraction_prompt(
+            pattern=pattern,
+            component_name=component_name,
             structural_findings=findings,
         )
 
-        assert "semantic_role" in prompt
-        assert "factory" in prompt.lower() or "registry" in prompt.lower()
-        assert "business_context" in prompt
-        assert "risk_level" in prompt
-        assert "impacted_workflows" in prompt
+        lowered = prompt.lower()
+        assert all(field in prompt for field in required_fields)
+        assert any(term in lowered for term in any_terms)
 
-    def test_semantic_analyzer_prompt_generation_pattern_b(self):
-        """Semantic analyzer should generate Pattern B (Workflow) prompts."""
+    def test_semantic_prompt_is_cached_for_identical_inputs(self, schemas):
+        """Repeat prompt builds for the same component should reuse the cached string."""
         findings = {
-            "class_names": ["Orchestrator", "Validator", "Processor"],
-            "public_methods": ["execute", "validate", "process"],
-            "dependencies": [],
-            "inheritance": "None",
+            "class_names": ["BaseParser", "PDFParser"],
+            "public_methods": ["parse"],
         }
 
-        prompt = build_semantic_extraction_prompt(
-            pattern="B",
-            component_name="WorkflowEngine",
+        first = schemas.build_semantic_extraction_prompt(
+            pattern="A",
+            component_name="ParserRegistry",
             structural_findings=findings,
         )
-
-        assert "orchestrator" in prompt.lower() or "orchestration" in prompt.lower()
-        assert "business_context" in prompt
-        assert "flow_position" in prompt
-
-    def test_semantic_analyzer_prompt_generation_pattern_c(self):
-        """Semantic analyzer should generate Pattern C (API/Service) prompts."""
-        findings = {
-            "class_names": ["APIGateway", "AuthHandler", "DataService"],
-            "public_methods": ["POST", "GET", "DELETE"],
-            "dependencies": ["database", "auth_service"],
-            "inheritance": "APIGateway -> {AuthHandler, DataService}",
-        }
-
-        prompt = build_semantic_extraction_prompt(
-            pattern="C",
-            component_name="RestAPI",
-            structural_findings=findings,
+        second = schemas.build_semantic_extraction_prompt(
+            pattern="a",
+            component_name="ParserRegistry",
+            structural_findings=dict(findings),
         )
 
-        assert "gateway" in prompt.lower() or "api" in prompt.lower()
-        assert "business_context" in prompt
-        assert "risk_level" in prompt
+        assert first is second
 
-    def test_format_structural_findings(self):
+    def test_format_structural_findings(self, schemas):
         """format_structural_findings should produce readable findings."""
         findings = {
             "class_names": ["Parser", "Validator"],
@@ -138,14 +221,14 @@ class TestSemanticMetadataEnd2End:
             "attributes": ["config", "logger"],
         }
 
-        formatted = format_structural_findings(findings, pattern="A")
+        formatted = schemas.format_structural_findings(findings, pattern="A")
 
         assert "Parser" in formatted
         assert "parse" in formatted
         assert "file_io" in formatted
         assert "Validator" in formatted
 
-    def test_semantic_response_parsing(self):
+    def test_semantic_response_parsing(self, schemas):
         """parse_semantic_response should convert LLM response to SemanticMetadata."""
         response = {
             "semantic_role": "gateway",
@@ -157,17 +240,34 @@ class TestSemanticMetadataEnd2End:
             "impacted_workflows": ["document_upload", "analysis"],
         }
 
-        metadata = parse_semantic_response(response)
+        metadata = schemas.parse_semantic_response(response)
 
         assert metadata is not None
-        assert metadata.semantic_role == SemanticRole.GATEWAY
-        assert metadata.flow_position == BusinessFlowPosition.ENTRY_POINT
-        assert metadata.risk_level == RiskLevel.CRITICAL
+        assert metadata.semantic_role == schemas.SemanticRole.GATEWAY
+        assert metadata.flow_position == schemas.BusinessFlowPosition.ENTRY_POINT
+        assert metadata.risk_level == schemas.RiskLevel.CRITICAL
         assert len(metadata.impacted_workflows) == 2
 
-    def test_api_dto_with_semantic_metadata(self):
+    def test_semantic_response_parsing_returns_independent_metadata(self, schemas):
+        """Identical LLM responses parse to equal but independent SemanticMetadata."""
+        response = {
+            "semantic_role": "processor",
+            "business_context": "Parses invoices",
+            "risk_level": "high",
+            "impacted_workflows": ["billing"],
+        }
+
+        first = schemas.parse_semantic_response(response)
+        second = schemas.parse_semantic_response(dict(response))
+
+        assert first == second
+        first.impacted_workflows.append("refunds")
+        assert second.impacted_workflows == ["billing"]
+
+    def test_api_dto_with_semantic_metadata(self, schemas):
         """NavigationNodeDTO should serialize semantic metadata."""
-        semantic_dto = SemanticMetadataDTO(
+        # model_construct skips validation: only safe for trusted internal data
+        semantic_dto = schemas.SemanticMetadataDTO.model_construct(
             semantic_role="processor",
             business_context="Processes documents",
             business_significance="Enables document analysis",
@@ -176,7 +276,7 @@ class TestSemanticMetadataEnd2End:
             impacted_workflows=["analysis"],
         )
 
-        node_dto = NavigationNodeDTO(
+        node_dto = schemas.NavigationNodeDTO.model_construct(
             node_key="doc-proc",
             title="Document Processor",
             node_type="class",
@@ -187,26 +287,30 @@ class TestSemanticMetadataEnd2End:
             business_narrative="Processes documents for analysis.",
         )
 
+        # Construct mode still tracks the explicitly set fields
+        assert {"semantic_metadata", "business_narrative"} <= node_dto.model_fields_set
+        assert "impacted_workflows" in semantic_dto.model_fields_set
+
         # Should serialize to JSON
         node_dict = node_dto.model_dump(exclude_none=True)
         assert "semantic_metadata" in node_dict
         assert node_dict["semantic_metadata"]["semantic_role"] == "processor"
         assert "business_narrative" in node_dict
 
-    def test_backward_compatibility_without_semantic_metadata(self):
+    def test_backward_compatibility_without_semantic_metadata(self, schemas):
         """Nodes without semantic metadata should still work (backward compatible)."""
-        node = NavigationNode(
+        node = schemas.NavigationNode(
             node_key="legacy",
             title="Legacy Node",
             node_type="function",
             description="Old node",
-            action=NavigationAction(kind="inspect_source"),
+            action=schemas.NavigationAction(kind="inspect_source"),
         )
 
         assert node.semantic_metadata is None
         assert node.business_narrative is None
 
-        node_dto = NavigationNodeDTO(
+        node_dto = schemas.NavigationNodeDTO(
             node_key="legacy",
             title="Legacy Node",
             node_type="function",
@@ -217,82 +321,64 @@ class TestSemanticMetadataEnd2End:
         assert node_dto.semantic_metadata is None
         assert node_dto.business_narrative is None
 
-    def test_semantic_roles_enum_coverage(self):
-        """All semantic roles should be defined and accessible."""
-        expected_roles = {
-            "gateway",
-            "processor",
-            "sink",
-            "orchestrator",
-            "validator",
-            "transformer",
-            "aggregator",
-            "dispatcher",
-            "adapter",
-            "mediator",
-            "repository",
-            "factory",
-            "strategy",
-        }
-
-        actual_roles = {role.value for role in SemanticRole}
-        assert actual_roles == expected_roles
-
-    def test_flow_positions_enum_coverage(self):
-        """All flow positions should be defined."""
-        expected_positions = {
-            "entry_point",
-            "validation",
-            "processing",
-            "transformation",
-            "aggregation",
-            "storage",
-            "output",
-            "error_handling",
-        }
-
-        actual_positions = {pos.value for pos in BusinessFlowPosition}
-        assert actual_positions == expected_positions
-
-    def test_risk_levels_enum_coverage(self):
-        """All risk levels should be defined."""
-        expected_levels = {"critical", "high", "medium", "low"}
-        actual_levels = {level.value for level in RiskLevel}
-        assert actual_levels == expected_levels
-
-    def test_semantic_metadata_complete_workflow(self):
+    @pytest.mark.parametrize(
+        "enum_name, values_name, expected",
+        [
+            ("SemanticRole", "SEMANTIC_ROLE_VALUES", EXPECTED_SEMANTIC_ROLES),
+            ("BusinessFlowPosition", "BUSINESS_FLOW_POSITION_VALUES", EXPECTED_FLOW_POSITIONS),
+            ("RiskLevel", "RISK_LEVEL_VALUES", EXPECTED_RISK_LEVELS),
+        ],
+    )
+    def test_enum_coverage(self, schemas, enum_name, values_name, expected):
+        """Each semantic enum and its exported value set should match the expected values."""
+        enum_cls = getattr(schemas, enum_name)
+        assert frozenset(member.value for member in enum_cls) == expected
+        assert getattr(schemas, values_name) == expected
+
+    def test_semantic_metadata_complete_workflow(self, schemas):
         """Test complete workflow: create metadata -> serialize -> validate."""
         # 1. Create semantic metadata
-        metadata = SemanticMetadata(
-            semantic_role=SemanticRole.ORCHESTRATOR,
+        metadata = schemas.SemanticMetadata(
+            semantic_role=schemas.SemanticRole.ORCHESTRATOR,
             business_context="Coordinates workflow execution",
             business_significance="Central coordination point",
-            flow_position=BusinessFlowPosition.PROCESSING,
-            risk_level=RiskLevel.HIGH,
+            flow_position=schemas.BusinessFlowPosition.PROCESSING,
+            risk_level=schemas.RiskLevel.HIGH,
             dependencies_description="Message queue, state store",
             impacted_workflows=["order_processing", "payment"],
         )
 
         # 2. Create navigation node with metadata
-        node = NavigationNode(
+        node = schemas.NavigationNode(
             node_key="workflow-orchestrator",
             title="Workflow Orchestrator",
             node_type="class",
             description="Coordinates workflow execution",
-            action=NavigationAction(kind="component_drilldown", target_id="orch-456"),
+            action=schemas.NavigationAction(kind="component_drilldown", target_id="orch-456"),
             semantic_metadata=metadata,
             business_narrative="The Workflow Orchestrator is the central coordinator that ensures all workflow steps execute in proper sequence and state is maintained.",
         )
 
-        # 3. Serialize to DTO
-        node_dto = NavigationNodeDTO(
+        # JSON-mode dump matches the hand-built API dict (enums as strings)
+        assert metadata.model_dump(mode="json") == {
+            "semantic_role": "orchestrator",
+            "business_context": "Coordinates workflow execution",
+            "business_significance": "Central coordination point",
+            "flow_position": "processing",
+            "risk_level": "high",
+            "dependencies_description": "Message queue, state store",
+            "impacted_workflows": ["order_processing", "payment"],
+        }
+
+        # 3. Serialize to DTO (node and metadata are already validated, so skip re-validation)
+        node_dto = schemas.NavigationNodeDTO.model_construct(
             node_key=node.node_key,
             title=node.title,
             node_type=node.node_type,
             description=node.description,
             action_kind=node.action.kind,
             target_id=node.action.target_id,
-            semantic_metadata=SemanticMetadataDTO(
+            semantic_metadata=schemas.SemanticMetadataDTO.model_construct(
                 semantic_role=metadata.semantic_role.value,
                 business_context=metadata.business_context,
                 business_significance=metadata.business_significance,
@@ -305,16 +391,18 @@ class TestSemanticMetadataEnd2End:
         )
 
         # 4. Verify serialization
+        assert "semantic_metadata" in node_dto.model_fields_set
         dto_dict = node_dto.model_dump()
         assert dto_dict["semantic_metadata"]["semantic_role"] == "orchestrator"
         assert len(dto_dict["semantic_metadata"]["impacted_workflows"]) == 2
         assert "Orchestrator" in dto_dict["business_narrative"]
 
         # 5. JSON should be serializable (for API response)
-        import json
-        json_str = json.dumps(dto_dict)
-        restored = json.loads(json_str)
+        raw = node_dto.model_dump_json(exclude_none=True)
+        restored = orjson.loads(raw)
         assert restored["semantic_metadata"]["semantic_role"] == "orchestrator"
+        assert restored["semantic_metadata"]["impacted_workflows"] == ["order_processing", "payment"]
+        assert restored["business_narrative"] == node.business_narrative
 
 
 if __name__ == "__main__":
@@ -7,6 +7,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from enum import Enum
+from typing import List, NamedTuple, Optional
 
 
 class SemanticRole(str, Enum):
@@ -28,31 +29,62 @@ class RiskLevel(str, Enum):
     HIGH = "high"
 
 
-class SemanticMetadata:
+class SemanticMetadata(NamedTuple):
     """Simplified semantic metadata for testing."""
-    def __init__(self, semantic_role=None, business_context=None,
-                 business_significance=None, flow_position=None,
-                 risk_level=None, dependencies_description=None,
-                 impacted_workflows=None):
-        self.semantic_role = semantic_role
-        self.business_context = business_context
-        self.business_significance = business_significance
-        self.flow_position = flow_position
-        self.risk_level = risk_level
-        self.dependencies_description = dependencies_description
-        self.impacted_workflows = impacted_workflows
-
-
-class NavigationNode:
+    semantic_role: Optional[SemanticRole] = None
+    business_context: Optional[str] = None
+    business_significance: Optional[str] = None
+    flow_position: Optional[BusinessFlowPosition] = None
+    risk_level: Optional[RiskLevel] = None
+    dependencies_description: Optional[str] = None
+    impacted_workflows: Optional[List[str]] = None
+
+
+class NavigationNode(NamedTuple):
     """Simplified navigation node for testing."""
-    def __init__(self, node_key, title, node_type, description,
-                 semantic_metadata=None, business_narrative=None):
-        self.node_key = node_key
-        self.title = title
-        self.node_type = node_type
-        self.description = description
-        self.semantic_metadata = semantic_metadata
-        self.business_narrative = business_narrative
+    node_key: str
+    title: str
+    node_type: str
+    description: str
+    semantic_metadata: Optional[SemanticMetadata] = None
+    business_narrative: Optional[str] = None
+
+
+# Enum member -> API string, resolved once instead of a .value lookup per field
+_ENUM_VALUE = {member: member.value for enum_cls in (SemanticRole, BusinessFlowPosition, RiskLevel) for member in enum_cls}
+
+
+# (field name, is_enum) in API output order; drives pack_semantic
+_SEMANTIC_FIELDS = (
+    ("semantic_role", True),
+    ("business_context", False),
+    ("business_significance", False),
+    ("flow_position", True),
+    ("risk_level", True),
+    ("dependencies_description", False),
+    ("impacted_workflows", False),
+)
+
+
+def pack_semantic(metadata):
+    """Convert SemanticMetadata to its API dict, replacing Enum members with their values."""
+    packed = {}
+    for name, is_enum in _SEMANTIC_FIELDS:
+        value = getattr(metadata, name)
+        packed[name] = _ENUM_VALUE[value] if is_enum and value is not None else value
+    return packed
+
+
+def format_node(node):
+    """Convert NavigationNode to its API dict in a single literal (as done in _format_node)."""
+    return {
+        "node_key": node.node_key,
+        "title": node.title,
+        "node_type": node.node_type,
+        "description": node.description,
+        **({"semantic_metadata": pack_semantic(node.semantic_metadata)} if node.semantic_metadata else {}),
+        **({"business_narrative": node.business_narrative} if node.business_narrative else {}),
+    }
 
 
 def test_semantic_metadata_enum_to_string_conversion():
@@ -69,23 +101,25 @@ def test_semantic_metadata_enum_to_string_conversion():
     )
 
     # Convert to dict (as done in _format_node)
-    node_dict = {
-        "semantic_metadata": {
-            "semantic_role": metadata.semantic_role.value if metadata.semantic_role else None,
-            "business_context": metadata.business_context,
-            "business_significance": metadata.business_significance,
-            "flow_position": metadata.flow_position.value if metadata.flow_position else None,
-            "risk_level": metadata.risk_level.value if metadata.risk_level else None,
-            "dependencies_description": metadata.dependencies_description,
-            "impacted_workflows": metadata.impacted_workflows,
-        }
-    }
+    node_dict = {"semantic_metadata": pack_semantic(metadata)}
+
+    # Mirrors carry no per-instance __dict__
+    assert not hasattr(metadata, "__dict__")
 
     # Verify conversion
     assert node_dict["semantic_metadata"]["semantic_role"] == "gateway"
     assert node_dict["semantic_metadata"]["flow_position"] == "entry_point"
     assert node_dict["semantic_metadata"]["risk_level"] == "critical"
     assert node_dict["semantic_metadata"]["impacted_workflows"] == ["user_auth", "data_ingestion"]
+    assert node_dict["semantic_metadata"] == {
+        "semantic_role": "gateway",
+        "business_context": "Entry point for API requests",
+        "business_significance": "Critical for user access",
+        "flow_position": "entry_point",
+        "risk_level": "critical",
+        "dependencies_description": "Load balancer, auth service",
+        "impacted_workflows": ["user_auth", "data_ingestion"],
+    }
     print("✓ Enum to string conversion works correctly")
 
 
@@ -106,37 +140,38 @@ def test_semantic_metadata_with_business_narrative():
     )
 
     # Convert node to dict
-    node_dict = {
-        "node_key": node.node_key,
-        "title": node.title,
-        "node_type": node.node_type,
-        "description": node.description,
-    }
+    node_dict = format_node(node)
 
-    # Add semantic metadata
-    if node.semantic_metadata:
-        node_dict["semantic_metadata"] = {
-            "semantic_role": node.semantic_metadata.semantic_role.value if node.semantic_metadata.semantic_role else None,
-            "business_context": node.semantic_metadata.business_context,
-            "business_significance": node.semantic_metadata.business_significance,
-            "flow_position": node.semantic_metadata.flow_position.value if node.semantic_metadata.flow_position else None,
-            "risk_level": node.semantic_metadata.risk_level.value if node.semantic_metadata.risk_level else None,
-            "dependencies_description": node.semantic_metadata.dependencies_description,
-            "impacted_workflows": node.semantic_metadata.impacted_workflows,
-        }
-
-    # Add business narrative
-    if node.business_narrative:
-        node_dict["business_narrative"] = node.business_narrative
+    assert not hasattr(node, "__dict__")
 
     # Verify structure
     assert "semantic_metadata" in node_dict
     assert "business_narrative" in node_dict
     assert node_dict["semantic_metadata"]["semantic_role"] == "gateway"
+    assert node_dict["semantic_metadata"]["business_significance"] is None
+    assert node_dict["semantic_metadata"]["impacted_workflows"] is None
     assert node_dict["business_narrative"] == "The API Gateway is the primary entry point for all external client requests."
     print("✓ Business narrative is correctly included in node dict")
 
 
+def test_enum_value_table_covers_all_members():
+    """Test that the packer's enum lookup table matches each member's value."""
+    members = [*SemanticRole, *BusinessFlowPosition, *RiskLevel]
+    assert len(_ENUM_VALUE) == len(members)
+    assert all(_ENUM_VALUE[m] == m.value for m in members)
+    print("✓ Enum value table covers all members")
+
+
+def test_packed_output_follows_field_table():
+    """Test that the packer emits every table field, in order, with enum values resolved."""
+    packed = pack_semantic(SemanticMetadata(semantic_role=SemanticRole.PROCESSOR))
+    assert list(packed) == [name for name, _ in _SEMANTIC_FIELDS]
+    assert packed["semantic_role"] == "processor"
+    assert type(packed["semantic_role"]) is str
+    assert all(packed[name] is None for name, _ in _SEMANTIC_FIELDS if name != "semantic_role")
+    print("✓ Packed output follows the field table")
+
+
 def test_semantic_metadata_none_handling():
     """Test that nodes without semantic metadata don't error."""
     node = NavigationNode(
@@ -148,20 +183,8 @@ def test_semantic_metadata_none_handling():
         business_narrative=None
     )
 
-    # Convert node to dict
-    node_dict = {
-        "node_key": node.node_key,
-        "title": node.title,
-        "node_type": node.node_type,
-        "description": node.description,
-    }
-
-    # Only add semantic metadata if present
-    if node.semantic_metadata:
-        node_dict["semantic_metadata"] = {}
-
-    if node.business_narrative:
-        node_dict["business_narrative"] = node.business_narrative
+    # Convert node to dict (semantic metadata and narrative only when present)
+    node_dict = format_node(node)
 
     # Verify no error and structure is correct
     assert "semantic_metadata" not in node_dict
@@ -173,5 +196,7 @@ def test_semantic_metadata_none_handling():
 if __name__ == "__main__":
     test_semantic_metadata_enum_to_string_conversion()
     test_semantic_metadata_with_business_narrative()
+    test_enum_value_table_covers_all_members()
+    test_packed_output_follows_field_table()
     test_semantic_metadata_none_handling()
     print("\n✅ All semantic metadata conversion tests passed!")
@@ -0,0 +1,15 @@
+import pytest
+
+import tools
+
+
+def test_lazy_tool_table_matches_all():
+    assert set(tools.__all__) == set(tools._LAZY_TOOLS)
+    assert len(tools.__all__) == len(set(tools.__all__))
+
+
+@pytest.mark.parametrize("name", tools.__all__)
+def test_tool_builders_resolve_to_callables(name):
+    builder = getattr(tools, name)
+    assert callable(builder)
+    assert vars(tools)[name] is builder
@@ -1,14 +1,45 @@
 """Utilities and agent tools for the ArchAI LangGraph stack."""
 
-from .analyze_inheritance_graph import build_analyze_inheritance_graph_tool  # noqa: F401
-from .call_graph_pagerank import build_call_graph_pagerank_tool  # noqa: F401
-from .extract_subgraph import build_extract_subgraph_tool  # noqa: F401
-from .find_paths import build_find_paths_tool  # noqa: F401
-from .get_source_code import build_get_source_code_tool  # noqa: F401
-from .list_core_models import build_list_core_models_tool  # noqa: F401
-from .list_entry_points import build_list_entry_point_tool  # noqa: F401
-from .scan_files import build_scan_files_tool  # noqa: F401
-from .search_codebase import build_search_codebase_tool  # noqa: F401
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .analyze_inheritance_graph import build_analyze_inheritance_graph_tool  # noqa: F401
+    from .call_graph_pagerank import build_call_graph_pagerank_tool  # noqa: F401
+    from .extract_subgraph import build_extract_subgraph_tool  # noqa: F401
+    from .find_paths import build_find_paths_tool  # noqa: F401
+    from .get_source_code import build_get_source_code_tool  # noqa: F401
+    from .list_core_models import build_list_core_models_tool  # noqa: F401
+    from .list_entry_points import build_list_entry_point_tool  # noqa: F401
+    from .scan_files import build_scan_files_tool  # noqa: F401
+    from .search_codebase import build_search_codebase_tool  # noqa: F401
+
+# Tool builder -> submodule; submodules are imported on first attribute access (PEP 562)
+_LAZY_TOOLS = {
+    "build_analyze_inheritance_graph_tool": "analyze_inheritance_graph",
+    "build_call_graph_pagerank_tool": "call_graph_pagerank",
+    "build_extract_subgraph_tool": "extract_subgraph",
+    "build_find_paths_tool": "find_paths",
+    "build_get_source_code_tool": "get_source_code",
+    "build_list_core_models_tool": "list_core_models",
+    "build_list_entry_point_tool": "list_entry_points",
+    "build_scan_files_tool": "scan_files",
+    "build_search_codebase_tool": "search_codebase",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_TOOLS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_LAZY_TOOLS))
+
 
 __all__ = [
     "build_analyze_inheritance_graph_tool",
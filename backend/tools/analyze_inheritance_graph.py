@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from collections import Counter
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import networkx as nx
 from langchain_core.tools import BaseTool, tool
@@ -10,7 +13,8 @@ from pydantic import BaseModel, Field
 from sqlalchemy import select
 
 from structural_scaffolding.database import ProfileRecord, create_session
-from tools.graph_queries import get_graph, node_snapshot
+from tools.graph_cache import register_cache_clear_hook
+from tools.graph_queries import get_graph, node_snapshots
 
 
 class AnalyzeInheritanceGraphInput(BaseModel):
@@ -27,100 +31,101 @@ class AnalyzeInheritanceGraphInput(BaseModel):
     )
 
 
+@lru_cache(maxsize=128)
 def _find_classes_in_scope_from_db(
     workspace_id: str,
     database_url: str | None,
     scope_path: str
-) -> List[str]:
+) -> Tuple[str, ...]:
     """Find all class ProfileRecords within the given scope.
 
     This queries ProfileRecord directly (not the CallGraph) to ensure
     we only return classes that have source code indexed in the database.
     This prevents returning nodes that exist in the CallGraph but have
     no source code available.
+
+    Results are cached per (workspace, database, scope) like the graph itself
+    and cleared together with it by clear_graph_cache().
     """
     session = create_session(database_url)
     try:
-        stmt = select(ProfileRecord).where(
+        # Only ids are needed; select the column instead of hydrating ORM rows
+        stmt = select(ProfileRecord.id).where(
             ProfileRecord.workspace_id == workspace_id,
             ProfileRecord.kind == "class",
             ProfileRecord.file_path.contains(scope_path),
         )
-        records = session.execute(stmt).scalars().all()
-        return [r.id for r in records]
+        return tuple(session.execute(stmt).scalars())
     finally:
         session.close()
 
 
-def _find_classes_in_scope(graph: nx.MultiDiGraph, scope_path: str) -> List[str]:
-    """Find all class nodes within the given scope.
+register_cache_clear_hook(_find_classes_in_scope_from_db.cache_clear)
+
+
+@lru_cache(maxsize=64)
+def _class_short_name_index(
+    workspace_id: str,
+    database_url: str | None,
+    scope_path: str,
+) -> Dict[str, str]:
+    """Map each class's short name (last '::' segment of its id) to the first class id with it.
 
-    DEPRECATED: Use _find_classes_in_scope_from_db instead to ensure
-    we only return classes with source code available.
+    Built from, and cached alongside, _find_classes_in_scope_from_db. Treat as read-only.
     """
-    classes = []
-    for node_id, attrs in graph.nodes(data=True):
-        file_path = attrs.get("file_path", "")
-        kind = attrs.get("kind", "")
-        # Match if file_path contains scope_path and node is a class
-        if scope_path in file_path and kind == "class":
-            classes.append(node_id)
-    return classes
+    index: Dict[str, str] = {}
+    for class_id in _find_classes_in_scope_from_db(workspace_id, database_url, scope_path):
+        index.setdefault(class_id.rsplit("::", 1)[-1], class_id)
+    return index
+
+
+register_cache_clear_hook(_class_short_name_index.cache_clear)
 
 
-def _find_base_class_candidates(graph: nx.MultiDiGraph, classes: List[str]) -> Dict[str, int]:
+def _find_base_class_candidates(graph: nx.MultiDiGraph, classes: Sequence[str]) -> Dict[str, int]:
     """Count how many times each class is inherited from (in-degree of INHERITS_FROM edges).
 
     Returns a dict mapping class_id -> inheritance_count.
     """
-    inheritance_count: Dict[str, int] = {}
-
-    for node_id in classes:
-        # Check if this class is inherited by others
-        # (i.e., has incoming INHERITS_FROM edges)
-        for predecessor in graph.predecessors(node_id):
-            edge_data = graph.get_edge_data(predecessor, node_id) or {}
-            for attrs in edge_data.values() if isinstance(edge_data, dict) else [edge_data]:
-                if isinstance(attrs, dict) and attrs.get("type") == "INHERITS_FROM":
-                    inheritance_count[node_id] = inheritance_count.get(node_id, 0) + 1
-
+    # Single pass over the incoming edges of all scoped classes (classes missing
+    # from the graph are skipped by in_edges)
+    inheritance_count: Counter[str] = Counter()
+    for _, node_id, edge_type in graph.in_edges(classes, data="type"):
+        if edge_type == "INHERITS_FROM":
+            inheritance_count[node_id] += 1
     return inheritance_count
 
 
-def _get_implementations(graph: nx.MultiDiGraph, base_class_id: str, workspace_id: str | None = None, database_url: str | None = None) -> List[Dict[str, Any]]:
+def _get_implementation_ids(graph: nx.MultiDiGraph, base_class_id: str) -> List[str]:
     """Find all classes that inherit from the given base class."""
-    implementations = []
-
-    # Find all predecessors (classes that inherit from base_class)
-    # Note: INHERITS_FROM edges go ChildClass -> ParentClass, so we look at predecessors
-    for predecessor in graph.predecessors(base_class_id):
-        edge_data = graph.get_edge_data(predecessor, base_class_id) or {}
-
-        # Check if there's an INHERITS_FROM edge
-        for attrs in edge_data.values() if isinstance(edge_data, dict) else [edge_data]:
-            if isinstance(attrs, dict) and attrs.get("type") == "INHERITS_FROM":
-                implementations.append(node_snapshot(graph, predecessor, workspace_id, database_url))
-                break
+    # INHERITS_FROM edges go ChildClass -> ParentClass, so children are predecessors
+    # dict.fromkeys keeps first-seen order and collapses parallel INHERITS_FROM edges
+    return list(dict.fromkeys(
+        predecessor
+        for predecessor, _, edge_type in graph.in_edges(base_class_id, data="type")
+        if edge_type == "INHERITS_FROM"
+    ))
 
-    return implementations
 
-
-def _get_parents(graph: nx.MultiDiGraph, class_id: str, workspace_id: str | None = None, database_url: str | None = None) -> List[Dict[str, Any]]:
+def _get_parent_ids(graph: nx.MultiDiGraph, class_id: str) -> List[str]:
     """Find all parent classes of the given class."""
-    parents = []
-
-    # Find all successors (classes that this class inherits from)
-    # Note: INHERITS_FROM edges go ChildClass -> ParentClass, so we look at successors
-    for successor in graph.successors(class_id):
-        edge_data = graph.get_edge_data(class_id, successor) or {}
+    # INHERITS_FROM edges go ChildClass -> ParentClass, so parents are successors
+    return list(dict.fromkeys(
+        successor
+        for _, successor, edge_type in graph.out_edges(class_id, data="type")
+        if edge_type == "INHERITS_FROM"
+    ))
 
-        # Check if there's an INHERITS_FROM edge
-        for attrs in edge_data.values() if isinstance(edge_data, dict) else [edge_data]:
-            if isinstance(attrs, dict) and attrs.get("type") == "INHERITS_FROM":
-                parents.append(node_snapshot(graph, successor, workspace_id, database_url))
-                break
 
-    return parents
+def _snapshot_map(
+    graph: nx.MultiDiGraph,
+    node_ids: Sequence[str],
+    workspace_id: str | None = None,
+    database_url: str | None = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Snapshot each distinct id once (one batched lookup) for reuse across result fields."""
+    unique_ids = list(dict.fromkeys(node_ids))
+    return dict(zip(unique_ids, node_snapshots(graph, unique_ids, workspace_id, database_url)))
 
 
 def _analyze_inheritance_scope(
@@ -136,11 +141,11 @@ def _analyze_inheritance_scope(
     source code indexed in the database, preventing 404 errors when frontend
     tries to fetch source code.
     """
-    graph = get_graph(workspace_id, database_url)
-    # Use database query to find classes - guarantees all have source code
+    # Use database query to find classes - guarantees all have source code.
+    # The graph is only loaded once the scope (and explicit target) resolve.
     classes_in_scope = _find_classes_in_scope_from_db(workspace_id, database_url, scope_path)
     if classes_in_scope:
-        print(f"[inheritance:classes_in_scope] Found {len(classes_in_scope)} classes: {classes_in_scope[:5]}", flush=True)
+        print(f"[inheritance:classes_in_scope] Found {len(classes_in_scope)} classes: {list(classes_in_scope[:5])}", flush=True)
 
     if not classes_in_scope:
         return {
@@ -150,11 +155,13 @@ def _analyze_inheritance_scope(
 
     # If target class is specified, analyze it directly
     if target_class_name:
-        target_id = None
-        for class_id in classes_in_scope:
-            if target_class_name in class_id:  # Match substring
-                target_id = class_id
-                break
+        # Exact class-name hit first; fall back to a substring scan of the ids
+        target_id = _class_short_name_index(workspace_id, database_url, scope_path).get(target_class_name)
+        if target_id is None:
+            target_id = next(
+                (class_id for class_id in classes_in_scope if target_class_name in class_id),
+                None,
+            )
 
         if not target_id:
             return {
@@ -162,16 +169,20 @@ def _analyze_inheritance_scope(
                 "error": f"Class '{target_class_name}' not found in scope '{scope_path}'",
             }
 
-        parents = _get_parents(graph, target_id, workspace_id, database_url)
+        graph = get_graph(workspace_id, database_url)
+        parent_ids = _get_parent_ids(graph, target_id)
+        child_ids = _get_implementation_ids(graph, target_id)
+        snapshots = _snapshot_map(graph, [target_id, *parent_ids, *child_ids], workspace_id, database_url)
         return {
             "success": True,
             "mode": "explicit",
-            "target_class": node_snapshot(graph, target_id, workspace_id, database_url),
-            "parents": parents,
-            "children": _get_implementations(graph, target_id, workspace_id, database_url),
+            "target_class": snapshots[target_id],
+            "parents": [snapshots[node_id] for node_id in parent_ids],
+            "children": [snapshots[node_id] for node_id in child_ids],
         }
 
     # Auto-discover: find the most-inherited base class
+    graph = get_graph(workspace_id, database_url)
     inheritance_counts = _find_base_class_candidates(graph, classes_in_scope)
 
     if not inheritance_counts:
@@ -180,10 +191,12 @@ def _analyze_inheritance_scope(
             "error": f"No inheritance patterns found in scope '{scope_path}'",
         }
 
-    dominant_base = max(inheritance_counts, key=inheritance_counts.get)
-    count = inheritance_counts[dominant_base]
+    dominant_base, count = max(inheritance_counts.items(), key=itemgetter(1))
 
-    implementations = _get_implementations(graph, dominant_base, workspace_id, database_url)
+    implementation_ids = _get_implementation_ids(graph, dominant_base)
+    parent_ids = _get_parent_ids(graph, dominant_base)
+    snapshots = _snapshot_map(graph, [dominant_base, *implementation_ids, *parent_ids], workspace_id, database_url)
+    implementations = [snapshots[node_id] for node_id in implementation_ids]
     print(f"[inheritance:implementations] Found {len(implementations)} implementations", flush=True)
     if implementations:
         for impl in implementations[:3]:
@@ -195,10 +208,10 @@ def _analyze_inheritance_scope(
         "success": True,
         "mode": "auto-discover",
         "pattern_detected": "Plugin Architecture" if count >= 2 else "Class Hierarchy",
-        "dominant_base_class": node_snapshot(graph, dominant_base, workspace_id, database_url),
+        "dominant_base_class": snapshots[dominant_base],
         "inheritance_depth": count,
         "implementations": implementations,
-        "parents": _get_parents(graph, dominant_base, workspace_id, database_url),
+        "parents": [snapshots[node_id] for node_id in parent_ids],
     }
 
 
@@ -2,16 +2,31 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
+import heapq
+import operator
+from itertools import compress
+from typing import Any, Dict, List, Mapping, Tuple
 
 import networkx as nx
 from langchain_core.tools import BaseTool, tool
 from pydantic import BaseModel, Field
 
-from .graph_queries import get_graph, normalise_category
-
-DEFAULT_EDGE_WEIGHT = 1.0
-WEIGHT_ATTR = "weight"
+try:  # optional: vectorised power iteration
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = None
+    sparse = None
+
+from .graph_queries import (
+    DEFAULT_EDGE_WEIGHT,
+    WEIGHT_ATTR,
+    build_call_edge_graph,
+    get_call_projection,
+    get_graph,
+    get_node_categories,
+    normalise_category,
+)
 
 CATEGORY_RANK_MULTIPLIER: Dict[str, float] = {
     "service": 4.0,
@@ -33,75 +48,165 @@ class PageRankInput(BaseModel):
     limit: int = Field(10, ge=1, le=1000, description="Number of top-ranked nodes to return.")
 
 
-def _build_call_edge_graph(graph: nx.MultiDiGraph) -> nx.DiGraph:
-    """Project the multi-graph onto a weighted DiGraph using CALL edges only."""
-    call_graph = nx.DiGraph()
-    for node, attrs in graph.nodes(data=True):
-        call_graph.add_node(node, **attrs)
+def _pagerank_python(
+    nodes: List[str],
+    predecessors: Dict[str, List[str]],
+    edge_weights: Dict[Tuple[str, str], float],
+    out_weight_sum: Dict[str, float],
+    damping: float,
+    max_iter: int,
+    tol: float,
+) -> Dict[str, float]:
+    """Weighted power iteration in pure Python (fallback when SciPy is unavailable).
+
+    The inbound (predecessor index, transition probability) pairs are resolved
+    once up front, so each iteration is list indexing and multiply-adds only.
+    """
+    node_count = len(nodes)
+    index = {node: position for position, node in enumerate(nodes)}
+
+    inbound: List[List[Tuple[int, float]]] = []
+    for node in nodes:
+        pairs = []
+        for pred in predecessors[node]:
+            total = out_weight_sum.get(pred, 0.0)
+            if total <= 0.0:
+                continue
+            weight = edge_weights.get((pred, node), DEFAULT_EDGE_WEIGHT)
+            if weight > 0.0:
+                pairs.append((index[pred], weight / total))
+        inbound.append(pairs)
+    dangling = [index[node] for node, total in out_weight_sum.items() if total <= 0.0]
+    teleport = (1.0 - damping) / node_count
+
+    # Double-buffered: each round fills ``updated`` from ``ranks`` and the two swap
+    ranks = [1.0 / node_count] * node_count
+    updated = [0.0] * node_count
+    for _ in range(max_iter):
+        base = teleport + damping * sum(ranks[i] for i in dangling) / node_count
+        for position, pairs in enumerate(inbound):
+            updated[position] = base + damping * sum(ranks[i] * share for i, share in pairs)
+        ranks, updated = updated, ranks
+        if sum(map(abs, map(operator.sub, ranks, updated))) < tol:
+            break
+
+    return dict(zip(nodes, ranks))
+
 
-    for source, target, data in graph.edges(data=True):
-        if data.get("type") != "CALLS":
-            continue
-        try:
-            weight = max(float(data.get(WEIGHT_ATTR, DEFAULT_EDGE_WEIGHT)), 0.0)
-        except (TypeError, ValueError):
-            weight = DEFAULT_EDGE_WEIGHT
+def _pagerank_sparse(
+    nodes: List[str],
+    edge_weights: Dict[Tuple[str, str], float],
+    out_weight_sum: Dict[str, float],
+    damping: float,
+    max_iter: int,
+    tol: float,
+) -> "np.ndarray":
+    """Same iteration as _pagerank_python, as a CSR transition-matrix product.
 
-        if call_graph.has_edge(source, target):
-            call_graph[source][target][WEIGHT_ATTR] += weight
-        else:
-            call_graph.add_edge(source, target, **{WEIGHT_ATTR: weight})
+    Returns the raw scores as an array aligned with ``nodes``.
+    """
+    node_count = len(nodes)
+    index = {node: position for position, node in enumerate(nodes)}
+
+    rows: List[int] = []
+    cols: List[int] = []
+    data: List[float] = []
+    for (source, target), weight in edge_weights.items():
+        total = out_weight_sum[source]
+        if weight > 0.0 and total > 0.0:
+            rows.append(index[target])
+            cols.append(index[source])
+            data.append(weight / total)
+
+    transition = sparse.csr_matrix((data, (rows, cols)), shape=(node_count, node_count))
+    dangling = np.fromiter((out_weight_sum[node] <= 0.0 for node in nodes), dtype=bool, count=node_count)
+    teleport = (1.0 - damping) / node_count
+
+    ranks = np.full(node_count, 1.0 / node_count)
+    residual = np.empty(node_count)  # reused for the L1 convergence check
+    for _ in range(max_iter):
+        dangling_mass = damping * ranks[dangling].sum() / node_count
+        updated = transition @ ranks
+        updated *= damping
+        updated += teleport + dangling_mass
+        np.subtract(updated, ranks, out=residual)
+        np.abs(residual, out=residual)
+        ranks = updated
+        if residual.sum() < tol:
+            break
 
-    return call_graph
+    return ranks
 
 
-def _compute_pagerank(graph: nx.MultiDiGraph) -> Dict[str, float]:
-    """Compute PageRank scores with category-based adjustments."""
-    call_graph = _build_call_edge_graph(graph)
+def _apply_category_multipliers_array(
+    nodes: List[str],
+    ranks: "np.ndarray",
+    categories: Mapping[str, str],
+) -> Dict[str, float]:
+    """Vectorised form of the category adjustment at the end of _compute_pagerank."""
+    normalisation = ranks.sum()
+    if normalisation <= 0:
+        return dict(zip(nodes, ranks.tolist()))
+
+    base_scores = ranks / normalisation
+    multipliers = np.fromiter(
+        (CATEGORY_RANK_MULTIPLIER.get(categories[node], 1.0) for node in nodes),
+        dtype=float,
+        count=len(nodes),
+    )
+    adjusted = base_scores * multipliers
+    keep = adjusted > 0.0
+    if not keep.any():
+        return dict(zip(nodes, base_scores.tolist()))
+
+    adjusted = adjusted[keep]
+    adjusted /= adjusted.sum()
+    return dict(zip(compress(nodes, keep.tolist()), adjusted.tolist()))
+
+
+def _compute_pagerank(
+    graph: nx.MultiDiGraph,
+    call_graph: nx.DiGraph | None = None,
+    categories: Mapping[str, str] | None = None,
+) -> Dict[str, float]:
+    """Compute PageRank scores with category-based adjustments.
+
+    Pass the graph's cached CALLS projection (get_call_projection) as
+    ``call_graph`` and its node categories (get_node_categories) as
+    ``categories`` to avoid recomputing them on every call.
+
+    The power iteration is kept in-tree rather than delegated to nx.pagerank:
+    that raises PowerIterationFailedConvergence instead of returning the last
+    iterate, and scales ``tol`` by the node count, both of which would change
+    the rankings tools return. With SciPy installed the CSR kernel is the
+    same sparse product nx.pagerank runs.
+    """
+    if call_graph is None:
+        call_graph = build_call_edge_graph(graph)
     if call_graph.number_of_nodes() == 0:
         return {}
 
     damping, max_iter, tol = 0.85, 100, 1.0e-6
     nodes = list(call_graph.nodes())
-    node_count = len(nodes)
-    ranks = {node: 1.0 / node_count for node in nodes}
 
-    predecessors = {node: list(call_graph.predecessors(node)) for node in nodes}
-    successors = {node: list(call_graph.successors(node)) for node in nodes}
-
-    edge_weights: Dict[Tuple[str, str], float] = {}
-    out_weight_sum: Dict[str, float] = {}
-    for source in nodes:
-        total = 0.0
-        for target in successors[source]:
-            try:
-                weight = max(float(call_graph[source][target].get(WEIGHT_ATTR, DEFAULT_EDGE_WEIGHT)), 0.0)
-            except (TypeError, ValueError):
-                weight = DEFAULT_EDGE_WEIGHT
-            edge_weights[(source, target)] = weight
-            if weight > 0.0:
-                total += weight
-        out_weight_sum[source] = total
+    # build_call_edge_graph already coerced weights to non-negative floats, so
+    # edge weights and per-node out-weight totals are each a single pass
+    edge_weights: Dict[Tuple[str, str], float] = {
+        (source, target): weight
+        for source, target, weight in call_graph.edges(data=WEIGHT_ATTR, default=DEFAULT_EDGE_WEIGHT)
+    }
+    out_weight_sum: Dict[str, float] = dict(call_graph.out_degree(weight=WEIGHT_ATTR))
 
-    dangling_nodes = [node for node, total in out_weight_sum.items() if total <= 0.0]
+    if categories is None:
+        node_attrs = graph.nodes
+        categories = {node: normalise_category(node_attrs[node]) for node in nodes}
 
-    for _ in range(max_iter):
-        previous = ranks.copy()
-        dangling_mass = damping * sum(previous[node] for node in dangling_nodes) / node_count
-
-        for node in nodes:
-            rank_sum = 0.0
-            for pred in predecessors[node]:
-                total = out_weight_sum.get(pred, 0.0)
-                if total <= 0.0:
-                    continue
-                weight = edge_weights.get((pred, node), DEFAULT_EDGE_WEIGHT)
-                if weight > 0.0:
-                    rank_sum += previous[pred] * (weight / total)
-            ranks[node] = (1.0 - damping) / node_count + damping * rank_sum + dangling_mass
-
-        if sum(abs(ranks[n] - previous[n]) for n in nodes) < tol:
-            break
+    if sparse is not None:
+        ranks_array = _pagerank_sparse(nodes, edge_weights, out_weight_sum, damping, max_iter, tol)
+        return _apply_category_multipliers_array(nodes, ranks_array, categories)
+
+    predecessors = {node: list(call_graph.predecessors(node)) for node in nodes}
+    ranks = _pagerank_python(nodes, predecessors, edge_weights, out_weight_sum, damping, max_iter, tol)
 
     # Normalize and apply category multipliers
     normalisation = sum(ranks.values())
@@ -111,7 +216,7 @@ def _compute_pagerank(graph: nx.MultiDiGraph) -> Dict[str, float]:
     base_scores = {node: score / normalisation for node, score in ranks.items()}
     adjusted_scores = {}
     for node, score in base_scores.items():
-        category = normalise_category(graph.nodes[node])
+        category = categories[node]
         multiplier = CATEGORY_RANK_MULTIPLIER.get(category, 1.0)
         adjusted = score * multiplier
         if adjusted > 0.0:
@@ -124,14 +229,14 @@ def _compute_pagerank(graph: nx.MultiDiGraph) -> Dict[str, float]:
     return {node: value / adjusted_total for node, value in adjusted_scores.items()} if adjusted_total > 0 else adjusted_scores
 
 
-def _format_node_entry(node_id: str, score: float, graph: nx.MultiDiGraph) -> Dict[str, Any]:
+def _format_node_entry(node_id: str, score: float, graph: nx.MultiDiGraph, category: str | None = None) -> Dict[str, Any]:
     node_attrs = graph.nodes[node_id]
     return {
         "id": node_id,
         "score": score,
         "label": node_attrs.get("label"),
         "kind": node_attrs.get("kind"),
-        "category": normalise_category(node_attrs),
+        "category": category if category is not None else normalise_category(node_attrs),
         "file_path": node_attrs.get("file_path"),
     }
 
@@ -143,11 +248,15 @@ def build_call_graph_pagerank_tool(workspace_id: str, database_url: str | None =
     def rank_call_graph_nodes(limit: int = 10) -> List[Dict[str, Any]]:
         """Return top-N call graph nodes ranked by PageRank score."""
         graph = get_graph(workspace_id, database_url)
-        scores = _compute_pagerank(graph)
+        categories = get_node_categories(graph)
+        scores = _compute_pagerank(graph, get_call_projection(graph), categories)
         if not scores:
             return []
-        ordered = sorted(scores.items(), key=lambda item: item[1], reverse=True)
-        return [_format_node_entry(node_id, score, graph) for node_id, score in ordered[:limit]]
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [
+            _format_node_entry(node_id, score, graph, categories[node_id])
+            for node_id, score in top
+        ]
 
     return rank_call_graph_nodes
 
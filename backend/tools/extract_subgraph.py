@@ -4,20 +4,39 @@ from __future__ import annotations
 
 from collections import deque
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Set, Tuple
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple
 
 import networkx as nx
 from langchain_core.tools import BaseTool, tool
 from pydantic import BaseModel, Field
 from sqlalchemy import select
+from sqlalchemy.orm import Session
 
 from structural_scaffolding.database import ProfileRecord, create_session
 
-from .graph_queries import get_graph, normalise_category
+from .graph_cache import register_cache_clear_hook
+from .graph_queries import get_graph, get_node_categories
 
 DEFAULT_MAX_DEPTH = 2
 DEFAULT_MAX_NODES = 30
 
+# Columns read for node summaries; fetched as plain rows rather than ORM objects
+_SUMMARY_COLUMNS = (
+    ProfileRecord.id,
+    ProfileRecord.kind,
+    ProfileRecord.file_path,
+    ProfileRecord.function_name,
+    ProfileRecord.class_name,
+    ProfileRecord.start_line,
+    ProfileRecord.end_line,
+    ProfileRecord.docstring,
+    ProfileRecord.parameters,
+)
+
 
 @dataclass(frozen=True)
 class ParsedNodeId:
@@ -43,33 +62,9 @@ class ParsedNodeId:
             node_id: The node ID to parse
 
         Returns:
-            ParsedNodeId with identified components
+            ParsedNodeId with identified components (cached; instances are frozen)
         """
-        if not node_id.startswith("python::"):
-            raise ValueError(f"Invalid node_id format: {node_id}. Must start with 'python::'")
-
-        parts = node_id[8:].split("::")  # Remove "python::" prefix
-
-        if len(parts) == 1:
-            # File level only
-            return cls(language="python", file_path=parts[0])
-
-        file_path = parts[0]
-
-        if len(parts) == 2:
-            # Class or function level
-            return cls(language="python", file_path=file_path, class_name=parts[1])
-
-        if len(parts) >= 3:
-            # Method level: class_name::method_name
-            return cls(
-                language="python",
-                file_path=file_path,
-                class_name=parts[1],
-                method_name=parts[2],
-            )
-
-        raise ValueError(f"Invalid node_id format: {node_id}")
+        return _parse_node_id(cls, node_id)
 
     def to_node_id(self) -> str:
         """Convert back to node_id string format."""
@@ -84,13 +79,43 @@ class ParsedNodeId:
         """Get the class-level node_id (for graph lookup)."""
         if not self.class_name:
             return self.to_node_id()
-        return f"{self.language}::{self.file_path}::{self.class_name}"
+        return "::".join((self.language, self.file_path, self.class_name))
 
     def is_method(self) -> bool:
         """Check if this is a method-level node_id."""
         return self.method_name is not None
 
 
+@lru_cache(maxsize=4096)
+def _parse_node_id(cls: type, node_id: str) -> ParsedNodeId:
+    """Uncached body of ParsedNodeId.parse, memoized per (class, node_id)."""
+    if not node_id.startswith("python::"):
+        raise ValueError(f"Invalid node_id format: {node_id}. Must start with 'python::'")
+
+    parts = node_id[8:].split("::")  # Remove "python::" prefix
+
+    if len(parts) == 1:
+        # File level only
+        return cls(language="python", file_path=parts[0])
+
+    file_path = parts[0]
+
+    if len(parts) == 2:
+        # Class or function level
+        return cls(language="python", file_path=file_path, class_name=parts[1])
+
+    if len(parts) >= 3:
+        # Method level: class_name::method_name
+        return cls(
+            language="python",
+            file_path=file_path,
+            class_name=parts[1],
+            method_name=parts[2],
+        )
+
+    raise ValueError(f"Invalid node_id format: {node_id}")
+
+
 class ExtractSubgraphInput(BaseModel):
     anchor_node_id: str = Field(..., min_length=1, description="The node ID to start expansion from.")
     max_depth: int = Field(
@@ -110,19 +135,30 @@ class ExtractSubgraphInput(BaseModel):
         description="Whether to include source code snippets (first 500 chars) for each node.",
     )
 
-# TODO: 是不是做dfs对内存更好。。。
+
+# BFS rather than DFS: nodes are enqueued only when added to ``visited``, so the
+# queue never holds more than max_nodes entries, and level order is what makes
+# max_depth mean "within N hops" and fills the max_nodes budget nearest-first.
 def _bfs_expand(
     graph: nx.MultiDiGraph,
     anchor: str,
     max_depth: int,
     max_nodes: int,
-) -> Tuple[Set[str], List[Tuple[str, str, str]]]:
-    """BFS expand from anchor node, collecting nodes and edges."""
+) -> Tuple[Dict[str, Mapping[str, Any]], List[Tuple[str, str, str]]]:
+    """BFS expand from anchor node, collecting nodes (id -> graph attrs) and edges."""
     if anchor not in graph:
-        return set(), []
+        return {}, []
+
+    # The graph type is fixed for the whole expansion; resolve how to read edge attrs once
+    is_multi = graph.is_multigraph()
 
-    visited: Set[str] = {anchor}
+    def iter_attrs(edge_data: Dict[Any, Any]) -> Any:
+        return edge_data.values() if is_multi else (edge_data,)
+
+    node_attrs = graph.nodes
+    visited: Dict[str, Mapping[str, Any]] = {anchor: node_attrs[anchor]}
     edges: List[Tuple[str, str, str]] = []
+    seen_edges: Set[Tuple[str, str, str]] = set()  # O(1) dedup; ``edges`` keeps discovery order
     queue: deque[Tuple[str, int]] = deque([(anchor, 0)])
 
     while queue and len(visited) < max_nodes:
@@ -130,76 +166,84 @@ def _bfs_expand(
         if depth >= max_depth:
             continue
 
-        # Expand outgoing edges (calls)
-        for neighbor in graph.successors(current):
-            edge_data = graph.get_edge_data(current, neighbor) or {}
-            for attrs in edge_data.values() if graph.is_multigraph() else [edge_data]:
-                edge_type = attrs.get("type", "CALLS")
-                if (current, neighbor, edge_type) not in edges:
-                    edges.append((current, neighbor, edge_type))
-
-            if neighbor not in visited and len(visited) < max_nodes:
-                visited.add(neighbor)
+        # Outgoing (calls) then incoming (called_by) edges, as (neighbor, source, target,
+        # edge data); adj/pred hand back each neighbor's edge data without a second lookup
+        hops = chain(
+            ((neighbor, current, neighbor, edge_data) for neighbor, edge_data in graph.adj[current].items()),
+            ((neighbor, neighbor, current, edge_data) for neighbor, edge_data in graph.pred[current].items()),
+        )
+        for neighbor, source, target, edge_data in hops:
+            if neighbor not in visited:
+                if len(visited) >= max_nodes:
+                    # Budget spent: skip edges to nodes that will not be in the subgraph
+                    continue
+                # Mark visited on enqueue so each node is queued at most once
+                visited[neighbor] = node_attrs[neighbor]
                 queue.append((neighbor, depth + 1))
 
-        # Expand incoming edges (called_by)
-        for neighbor in graph.predecessors(current):
-            edge_data = graph.get_edge_data(neighbor, current) or {}
-            for attrs in edge_data.values() if graph.is_multigraph() else [edge_data]:
-                edge_type = attrs.get("type", "CALLS")
-                if (neighbor, current, edge_type) not in edges:
-                    edges.append((neighbor, current, edge_type))
-
-            if neighbor not in visited and len(visited) < max_nodes:
-                visited.add(neighbor)
-                queue.append((neighbor, depth + 1))
+            for attrs in iter_attrs(edge_data):
+                edge = (source, target, attrs.get("type", "CALLS"))
+                if edge not in seen_edges:
+                    seen_edges.add(edge)
+                    edges.append(edge)
 
     return visited, edges
 
 
-def _get_method_source(
-    node_id: str, workspace_id: str, database_url: str | None
-) -> Optional[Dict[str, Any]]:
+def _get_method_source(session: Session, node_id: str, workspace_id: str) -> Optional[Dict[str, Any]]:
     """
     Retrieve method-level source code from database.
 
     Fallback strategy when node is not found in call graph but exists in database.
 
     Args:
+        session: Open session, shared with the other fallback lookups of the call
         node_id: Full node ID (including method name)
         workspace_id: Workspace identifier
-        database_url: Database URL
 
     Returns:
         Dict with source_code, docstring, line ranges, or None if not found
     """
-    session = create_session(database_url)
-    try:
-        stmt = select(ProfileRecord).where(
-            ProfileRecord.id == node_id,
-            ProfileRecord.workspace_id == workspace_id,
-            ProfileRecord.kind == "method",
-        )
-        record = session.execute(stmt).scalar_one_or_none()
-
-        if not record:
-            return None
-
-        return {
-            "source_code": record.source_code or "",
-            "docstring": record.docstring or "",
-            "start_line": record.start_line,
-            "end_line": record.end_line,
-            "parameters": record.parameters,
-            "kind": record.kind,
-        }
-    finally:
-        session.close()
+    stmt = select(
+        ProfileRecord.source_code,
+        ProfileRecord.docstring,
+        ProfileRecord.start_line,
+        ProfileRecord.end_line,
+        ProfileRecord.parameters,
+        ProfileRecord.kind,
+    ).where(
+        ProfileRecord.id == node_id,
+        ProfileRecord.workspace_id == workspace_id,
+        ProfileRecord.kind == "method",
+    )
+    record = session.execute(stmt).one_or_none()
+
+    if not record:
+        return None
+
+    return {
+        "source_code": record.source_code or "",
+        "docstring": record.docstring or "",
+        "start_line": record.start_line,
+        "end_line": record.end_line,
+        "parameters": record.parameters,
+        "kind": record.kind,
+    }
+
 
+@lru_cache(maxsize=1024)
+def _path_context(file_path: str) -> str:
+    """Last (up to) 3 meaningful segments of a file path; sibling records share the result."""
+    path_parts = file_path.replace("\\", "/").split("/")
+    # Take last 2-3 meaningful segments
+    return "/".join([p for p in path_parts if p and not p.startswith(".")][-3:])
 
-def _generate_fallback_summary(record: ProfileRecord) -> str:
+
+def _generate_fallback_summary(record: Any) -> str:
     """Generate a summary when docstring is not available.
 
+    ``record`` is a ProfileRecord or a row carrying the _SUMMARY_COLUMNS.
+
     Uses function signature, class name, and file path context.
     """
     parts: List[str] = []
@@ -220,111 +264,150 @@ def _generate_fallback_summary(record: ProfileRecord) -> str:
 
     # Add file context
     if record.file_path:
-        # Extract meaningful path segments
-        path_parts = record.file_path.replace("\\", "/").split("/")
-        # Take last 2-3 meaningful segments
-        meaningful = [p for p in path_parts if p and not p.startswith(".")][-3:]
-        if meaningful:
-            parts.append(f"in {'/'.join(meaningful)}")
+        path_context = _path_context(record.file_path)
+        if path_context:
+            parts.append(f"in {path_context}")
 
     return " | ".join(parts) if parts else f"{record.kind} at line {record.start_line}"
 
 
+def _summarize_record(record: Any, include_source: bool) -> Dict[str, Any]:
+    """Summary dict for one ProfileRecord row (see _SUMMARY_COLUMNS)."""
+    summary: Dict[str, Any] = {
+        "kind": record.kind,
+        "file_path": record.file_path,
+        "function_name": record.function_name,
+        "class_name": record.class_name,
+        "start_line": record.start_line,
+        "end_line": record.end_line,
+        "line_range": f"{record.start_line}-{record.end_line}",
+    }
+
+    # Use docstring if available, otherwise generate fallback
+    if record.docstring and record.docstring.strip():
+        doc = record.docstring.strip()
+        summary["docstring"] = doc[:300] + "..." if len(doc) > 300 else doc
+    else:
+        summary["inferred_summary"] = _generate_fallback_summary(record)
+
+    if include_source and record.source_code:
+        # Truncate source to first 500 chars
+        src = record.source_code.strip()
+        summary["source_snippet"] = src[:500] + "..." if len(src) > 500 else src
+
+    if record.parameters:
+        summary["parameters"] = record.parameters
+
+    return summary
+
+
+def _query_node_summaries(
+    session: Session,
+    node_ids: Iterable[str],
+    workspace_id: str,
+    include_source: bool,
+) -> Dict[str, Dict[str, Any]]:
+    """Load docstrings and metadata from ProfileRecord for each node, on an open session."""
+    # source_code is the widest column; only fetch it when snippets are requested
+    columns = _SUMMARY_COLUMNS + ((ProfileRecord.source_code,) if include_source else ())
+    # node_ids is bounded by max_nodes, so a single IN (...) query suffices
+    stmt = select(*columns).where(
+        ProfileRecord.workspace_id == workspace_id,
+        ProfileRecord.id.in_(list(node_ids)),
+    )
+    return {record.id: _summarize_record(record, include_source) for record in session.execute(stmt)}
+
+
+@lru_cache(maxsize=32)
 def _load_node_summaries(
-    node_ids: Set[str],
+    node_ids: FrozenSet[str],
     workspace_id: str,
     database_url: str | None,
     include_source: bool,
-) -> Dict[str, Dict[str, Any]]:
-    """Load docstrings and metadata from ProfileRecord for each node."""
+) -> Mapping[str, Mapping[str, Any]]:
+    """Load docstrings and metadata from ProfileRecord for each node.
+
+    Cached per node set so re-expanding the same anchor skips the query. The
+    result is shared between calls, so it is returned read-only and
+    _build_node_payload copies the one mutable value (parameters) out of it.
+    Cleared by clear_graph_cache(), which Workspace runs after every
+    persist_profiles, and by save_graph.
+    """
     session = create_session(database_url)
     try:
-        stmt = select(ProfileRecord).where(
-            ProfileRecord.workspace_id == workspace_id,
-            ProfileRecord.id.in_(node_ids),
-        )
-        records = session.execute(stmt).scalars().all()
-
-        summaries: Dict[str, Dict[str, Any]] = {}
-        for record in records:
-            summary: Dict[str, Any] = {
-                "kind": record.kind,
-                "file_path": record.file_path,
-                "function_name": record.function_name,
-                "class_name": record.class_name,
-                "start_line": record.start_line,
-                "end_line": record.end_line,
-            }
-
-            # Use docstring if available, otherwise generate fallback
-            if record.docstring and record.docstring.strip():
-                doc = record.docstring.strip()
-                summary["docstring"] = doc[:300] + "..." if len(doc) > 300 else doc
-            else:
-                summary["inferred_summary"] = _generate_fallback_summary(record)
-
-            if include_source and record.source_code:
-                # Truncate source to first 500 chars
-                src = record.source_code.strip()
-                summary["source_snippet"] = src[:500] + "..." if len(src) > 500 else src
-
-            if record.parameters:
-                summary["parameters"] = record.parameters
-
-            summaries[record.id] = summary
-
-        return summaries
+        summaries = _query_node_summaries(session, node_ids, workspace_id, include_source)
     finally:
         session.close()
+    return MappingProxyType({node_id: MappingProxyType(summary) for node_id, summary in summaries.items()})
+
+
+register_cache_clear_hook(_load_node_summaries.cache_clear)
+
+
+def _build_node_payload(
+    node_id: str,
+    attrs: Mapping[str, Any],
+    anchor: str,
+    summary: Optional[Mapping[str, Any]],
+    category: str,
+) -> Dict[str, Any]:
+    """Build one node entry, merging its ProfileRecord summary when there is one."""
+    node_payload: Dict[str, Any] = {
+        "id": node_id,
+        "label": attrs.get("label"),
+        "kind": attrs.get("kind"),
+        "category": category,
+        "is_anchor": node_id == anchor,
+    }
+
+    # Merge summary from ProfileRecord
+    if summary is not None:
+        node_payload["file_path"] = summary.get("file_path")
+        node_payload["function_name"] = summary.get("function_name")
+        node_payload["class_name"] = summary.get("class_name")
+        node_payload["line_range"] = summary["line_range"]
+        node_payload["has_source"] = True  # Can use get_source_code on this node
+
+        # Include either docstring or inferred summary
+        if "docstring" in summary:
+            node_payload["summary"] = summary["docstring"]
+            node_payload["summary_source"] = "docstring"
+        elif "inferred_summary" in summary:
+            node_payload["summary"] = summary["inferred_summary"]
+            node_payload["summary_source"] = "inferred"
+
+        if "source_snippet" in summary:
+            node_payload["source_snippet"] = summary["source_snippet"]
+        if "parameters" in summary:
+            # Copied: cached summaries must not be reachable from tool output
+            node_payload["parameters"] = list(summary["parameters"])
+    else:
+        node_payload["file_path"] = attrs.get("file_path")
+        node_payload["summary"] = f"{attrs.get('kind', 'unknown')} node (no profile record)"
+        node_payload["summary_source"] = "graph_only"
+        node_payload["has_source"] = False  # Cannot use get_source_code - no profile record
+
+    return node_payload
 
 
 def _build_subgraph_payload(
     graph: nx.MultiDiGraph,
     anchor: str,
-    node_ids: Set[str],
+    node_ids: Mapping[str, Mapping[str, Any]],
     edges: List[Tuple[str, str, str]],
-    summaries: Dict[str, Dict[str, Any]],
+    summaries: Mapping[str, Mapping[str, Any]],
+    categories: Mapping[str, str],
 ) -> Dict[str, Any]:
-    """Build the final payload with nodes, edges, and summaries."""
-    nodes: List[Dict[str, Any]] = []
-    for node_id in sorted(node_ids):
-        attrs = graph.nodes.get(node_id, {})
-        node_payload: Dict[str, Any] = {
-            "id": node_id,
-            "label": attrs.get("label"),
-            "kind": attrs.get("kind"),
-            "category": normalise_category(attrs),
-            "is_anchor": node_id == anchor,
-        }
-
-        # Merge summary from ProfileRecord
-        if node_id in summaries:
-            summary = summaries[node_id]
-            node_payload["file_path"] = summary.get("file_path")
-            node_payload["function_name"] = summary.get("function_name")
-            node_payload["class_name"] = summary.get("class_name")
-            node_payload["line_range"] = f"{summary.get('start_line')}-{summary.get('end_line')}"
-            node_payload["has_source"] = True  # Can use get_source_code on this node
-
-            # Include either docstring or inferred summary
-            if "docstring" in summary:
-                node_payload["summary"] = summary["docstring"]
-                node_payload["summary_source"] = "docstring"
-            elif "inferred_summary" in summary:
-                node_payload["summary"] = summary["inferred_summary"]
-                node_payload["summary_source"] = "inferred"
-
-            if "source_snippet" in summary:
-                node_payload["source_snippet"] = summary["source_snippet"]
-            if "parameters" in summary:
-                node_payload["parameters"] = summary["parameters"]
-        else:
-            node_payload["file_path"] = attrs.get("file_path")
-            node_payload["summary"] = f"{attrs.get('kind', 'unknown')} node (no profile record)"
-            node_payload["summary_source"] = "graph_only"
-            node_payload["has_source"] = False  # Cannot use get_source_code - no profile record
-
-        nodes.append(node_payload)
+    """Build the final payload with nodes, edges, and summaries.
+
+    ``node_ids`` maps each node to the graph attrs captured by _bfs_expand;
+    ``categories`` is the graph's cached get_node_categories map.
+    """
+    nodes = [
+        _build_node_payload(node_id, attrs, anchor, summaries.get(node_id), categories[node_id])
+        for node_id, attrs in node_ids.items()
+    ]
+    nodes.sort(key=itemgetter("id"))
 
     edge_payloads: List[Dict[str, str]] = [
         {"source": src, "target": tgt, "type": edge_type}
@@ -363,59 +446,66 @@ def _extract_subgraph_impl(
     if anchor_node_id in graph:
         # Standard path: node is in graph, perform BFS expansion
         node_ids, edges = _bfs_expand(graph, anchor_node_id, max_depth, max_nodes)
-        summaries = _load_node_summaries(node_ids, workspace_id, database_url, include_source)
-        return _build_subgraph_payload(graph, anchor_node_id, node_ids, edges, summaries)
+        summaries = _load_node_summaries(frozenset(node_ids), workspace_id, database_url, include_source)
+        categories = get_node_categories(graph)
+        return _build_subgraph_payload(graph, anchor_node_id, node_ids, edges, summaries, categories)
 
     # STRATEGY 2️⃣: Fallback for method nodes not in graph
     if parsed.is_method():
-        # Try to retrieve method source code from database
-        method_source = _get_method_source(anchor_node_id, workspace_id, database_url)
-
-        if method_source:
-            # ✅ Found method in database → return its source code
-            node_payload = {
-                "id": anchor_node_id,
-                "title": parsed.method_name,
-                "kind": "method",
-                "category": "method",
-                "file_path": parsed.file_path,
-                "class_name": parsed.class_name,
-                "line_range": f"{method_source['start_line']}-{method_source['end_line']}",
-                "has_source": True,
-                "summary": method_source["docstring"] or f"Method {parsed.method_name}",
-                "summary_source": "docstring" if method_source["docstring"] else "inferred",
-            }
-
-            if method_source["source_code"] and include_source:
-                src = method_source["source_code"].strip()
-                node_payload["source_snippet"] = src[:500] + "..." if len(src) > 500 else src
-
-            if method_source["parameters"]:
-                node_payload["parameters"] = method_source["parameters"]
-
-            return {
-                "anchor": anchor_node_id,
-                "node_count": 1,
-                "edge_count": 0,
-                "nodes": [node_payload],
-                "edges": [],
-                "note": f"Method source code retrieved from database (not in call graph)",
-            }
-
-        # STRATEGY 3️⃣: Method not found, try to get class context
-        if parsed.class_name:
-            class_node_id = parsed.to_class_node_id()
-
-            if class_node_id in graph:
-                # Found the class → return its context with explanatory note
-                node_ids, edges = _bfs_expand(graph, class_node_id, max_depth, max_nodes)
-                summaries = _load_node_summaries(node_ids, workspace_id, database_url, include_source)
-                payload = _build_subgraph_payload(graph, class_node_id, node_ids, edges, summaries)
-                payload["note"] = (
-                    f"Method '{parsed.method_name}' not found in call graph. "
-                    f"Showing class '{parsed.class_name}' context instead."
-                )
-                return payload
+        # Strategies 2 and 3 share one session (and connection checkout)
+        session = create_session(database_url)
+        try:
+            # Try to retrieve method source code from database
+            method_source = _get_method_source(session, anchor_node_id, workspace_id)
+
+            if method_source:
+                # ✅ Found method in database → return its source code
+                node_payload = {
+                    "id": anchor_node_id,
+                    "title": parsed.method_name,
+                    "kind": "method",
+                    "category": "method",
+                    "file_path": parsed.file_path,
+                    "class_name": parsed.class_name,
+                    "line_range": f"{method_source['start_line']}-{method_source['end_line']}",
+                    "has_source": True,
+                    "summary": method_source["docstring"] or f"Method {parsed.method_name}",
+                    "summary_source": "docstring" if method_source["docstring"] else "inferred",
+                }
+
+                if method_source["source_code"] and include_source:
+                    src = method_source["source_code"].strip()
+                    node_payload["source_snippet"] = src[:500] + "..." if len(src) > 500 else src
+
+                if method_source["parameters"]:
+                    node_payload["parameters"] = method_source["parameters"]
+
+                return {
+                    "anchor": anchor_node_id,
+                    "node_count": 1,
+                    "edge_count": 0,
+                    "nodes": [node_payload],
+                    "edges": [],
+                    "note": f"Method source code retrieved from database (not in call graph)",
+                }
+
+            # STRATEGY 3️⃣: Method not found, try to get class context
+            if parsed.class_name:
+                class_node_id = parsed.to_class_node_id()
+
+                if class_node_id in graph:
+                    # Found the class → return its context with explanatory note
+                    node_ids, edges = _bfs_expand(graph, class_node_id, max_depth, max_nodes)
+                    summaries = _query_node_summaries(session, node_ids, workspace_id, include_source)
+                    categories = get_node_categories(graph)
+                    payload = _build_subgraph_payload(graph, class_node_id, node_ids, edges, summaries, categories)
+                    payload["note"] = (
+                        f"Method '{parsed.method_name}' not found in call graph. "
+                        f"Showing class '{parsed.class_name}' context instead."
+                    )
+                    return payload
+        finally:
+            session.close()
 
     # All strategies failed
     raise ValueError(
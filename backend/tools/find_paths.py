@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
 
 from langchain_core.tools import BaseTool, tool
 from pydantic import BaseModel, Field, field_validator
 
-from .graph_queries import EdgeHop, get_graph, iter_neighbors_by_type, node_snapshot
+from .graph_queries import EdgeHop, get_graph, iter_neighbors_by_type, node_snapshot, normalise_edge_types
 
 DEFAULT_EDGE_TYPES = ("CALLS", "USES", "DATA_ACCESS")
 
@@ -33,15 +33,15 @@ def _search_paths(
     *,
     start: str,
     targets: Set[str],
-    edge_filter: Sequence[str],
+    allowed_types: Optional[FrozenSet[str]],
     max_depth: int,
     max_paths: int,
+    snapshots_cache: Dict[str, Dict[str, Any]],
 ) -> List[Dict[str, Any]]:
+    """DFS for simple paths from ``start``; the filter and snapshot cache are shared across starts."""
     if not targets:
         return []
 
-    snapshots_cache: Dict[str, Dict[str, Any]] = {}
-
     def snapshot(node_id: str) -> Dict[str, Any]:
         if node_id not in snapshots_cache:
             snapshots_cache[node_id] = node_snapshot(graph, node_id)
@@ -60,7 +60,7 @@ def _search_paths(
         if len(edge_types_used) >= max_depth:
             continue
 
-        for hop in iter_neighbors_by_type(graph, current, edge_types=edge_filter):
+        for hop in iter_neighbors_by_type(graph, current, allowed_types=allowed_types):
             if hop.neighbor in path_nodes:
                 continue
             next_nodes = path_nodes + [hop.neighbor]
@@ -93,13 +93,24 @@ def _find_paths_impl(
     graph = get_graph(workspace_id, database_url)
     edge_filter = tuple({et.upper() for et in (edge_types or list(DEFAULT_EDGE_TYPES)) if et})
     targets = {node for node in end_nodes if node in graph}
+    # Built once for every start node (not per start or per expanded node)
+    allowed_types = normalise_edge_types(edge_filter)
+    snapshots_cache: Dict[str, Dict[str, Any]] = {}
 
     results: List[Dict[str, Any]] = []
     for start in start_nodes:
         if start not in graph:
             results.append({"start": start, "error": "Node does not exist.", "paths": []})
             continue
-        paths = _search_paths(graph, start=start, targets=targets, edge_filter=edge_filter, max_depth=max_depth, max_paths=max_paths)
+        paths = _search_paths(
+            graph,
+            start=start,
+            targets=targets,
+            allowed_types=allowed_types,
+            max_depth=max_depth,
+            max_paths=max_paths,
+            snapshots_cache=snapshots_cache,
+        )
         results.append({"start": start, "paths": paths})
     return results
 
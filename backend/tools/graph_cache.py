@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from functools import lru_cache
+from typing import Callable, List
 
 import networkx as nx
 
@@ -31,6 +32,8 @@ def save_graph(
         raise
     finally:
         session.close()
+    # A re-indexed workspace must not keep serving the previous graph
+    clear_graph_cache()
 
 
 def load_graph(
@@ -58,6 +61,16 @@ def graph_exists(workspace_id: str, database_url: str | None = None) -> bool:
         session.close()
 
 
+# Callbacks that clear caches derived from workspace graphs/profiles
+_CACHE_CLEAR_HOOKS: List[Callable[[], None]] = []
+
+
+def register_cache_clear_hook(hook: Callable[[], None]) -> Callable[[], None]:
+    """Register a callback run by clear_graph_cache (e.g. a derived lru_cache's cache_clear)."""
+    _CACHE_CLEAR_HOOKS.append(hook)
+    return hook
+
+
 # In-memory cache for loaded graphs (keyed by workspace_id + database_url)
 @lru_cache(maxsize=8)
 def load_graph_cached(workspace_id: str, database_url: str | None = None) -> nx.MultiDiGraph:
@@ -66,8 +79,10 @@ def load_graph_cached(workspace_id: str, database_url: str | None = None) -> nx.
 
 
 def clear_graph_cache() -> None:
-    """Clear the in-memory graph cache."""
+    """Clear the in-memory graph cache and every registered derived cache."""
     load_graph_cached.cache_clear()
+    for hook in _CACHE_CLEAR_HOOKS:
+        hook()
 
 
 __all__ = [
@@ -75,5 +90,6 @@ __all__ = [
     "graph_exists",
     "load_graph",
     "load_graph_cached",
+    "register_cache_clear_hook",
     "save_graph",
 ]
@@ -3,11 +3,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Sequence, Set, Tuple
+from types import MappingProxyType
+from typing import AbstractSet, Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Sequence, Set, Tuple
+from weakref import WeakKeyDictionary
 
 import networkx as nx
 
-from tools.graph_cache import load_graph_cached
+from tools.graph_cache import load_graph_cached, register_cache_clear_hook
+
+DEFAULT_EDGE_WEIGHT = 1.0
+WEIGHT_ATTR = "weight"
+# Shared read-only stand-in for missing node/edge attrs (no per-lookup ``{}``)
+EMPTY_ATTRS: Mapping[str, Any] = MappingProxyType({})
 
 
 def get_graph(workspace_id: str, database_url: str | None = None) -> nx.MultiDiGraph:
@@ -15,6 +22,97 @@ def get_graph(workspace_id: str, database_url: str | None = None) -> nx.MultiDiG
     return load_graph_cached(workspace_id, database_url)
 
 
+EdgeRecord = Tuple[str, str, Mapping[str, Any]]
+
+
+def partition_edges_by_type(graph: nx.MultiDiGraph) -> Dict[Any, List[EdgeRecord]]:
+    """Group every (source, target, attrs) edge of the graph by its ``type`` attribute."""
+    buckets: Dict[Any, List[EdgeRecord]] = {}
+    for edge in graph.edges(data=True):
+        buckets.setdefault(edge[2].get("type"), []).append(edge)
+    return buckets
+
+
+# Values derived from a graph (edge buckets, CALLS projection, categories, node
+# snapshots), keyed weakly on the graph object itself so they can never drift
+# from the graph they were built from; a reloaded graph is a new key. Kept off
+# graph.graph so nothing derived is ever persisted by save_graph.
+_DERIVED_CACHE: WeakKeyDictionary[nx.MultiDiGraph, Dict[str, Any]] = WeakKeyDictionary()
+register_cache_clear_hook(_DERIVED_CACHE.clear)
+
+
+def _derived(graph: nx.MultiDiGraph, name: str, build: Callable[[nx.MultiDiGraph], Any]) -> Any:
+    cache = _DERIVED_CACHE.setdefault(graph, {})
+    value = cache.get(name)
+    if value is None:
+        value = cache[name] = build(graph)
+    return value
+
+
+def get_edges_by_type(graph: nx.MultiDiGraph) -> Dict[Any, List[EdgeRecord]]:
+    """Get the graph's edges partitioned by type, built once per graph object.
+
+    Consumers that only need one edge type iterate its bucket instead of
+    filtering the full edge set. Shared between callers; treat as read-only.
+    """
+    return _derived(graph, "edges_by_type", partition_edges_by_type)
+
+
+def build_call_edge_graph(
+    graph: nx.MultiDiGraph,
+    call_edges: Iterable[EdgeRecord] | None = None,
+) -> nx.DiGraph:
+    """Project the multi-graph onto a weighted DiGraph using CALL edges only.
+
+    ``call_edges`` may be the pre-partitioned CALLS bucket (get_edges_by_type);
+    otherwise every edge of ``graph`` is scanned and filtered.
+    """
+    call_graph = nx.DiGraph()
+    for node, attrs in graph.nodes(data=True):
+        call_graph.add_node(node, **attrs)
+
+    if call_edges is None:
+        call_edges = (edge for edge in graph.edges(data=True) if edge[2].get("type") == "CALLS")
+
+    for source, target, data in call_edges:
+        try:
+            weight = max(float(data.get(WEIGHT_ATTR, DEFAULT_EDGE_WEIGHT)), 0.0)
+        except (TypeError, ValueError):
+            weight = DEFAULT_EDGE_WEIGHT
+
+        if call_graph.has_edge(source, target):
+            call_graph[source][target][WEIGHT_ATTR] += weight
+        else:
+            call_graph.add_edge(source, target, **{WEIGHT_ATTR: weight})
+
+    return call_graph
+
+
+def get_call_projection(graph: nx.MultiDiGraph) -> nx.DiGraph:
+    """Get the CALLS-only weighted projection of a graph, built once per graph object.
+
+    The projection is shared read-only between tools; it is cleared together
+    with the graph cache.
+    """
+    return _derived(graph, "call_projection", _build_call_projection)
+
+
+def _build_call_projection(graph: nx.MultiDiGraph) -> nx.DiGraph:
+    return build_call_edge_graph(graph, get_edges_by_type(graph).get("CALLS", ()))
+
+
+def get_node_categories(graph: nx.MultiDiGraph) -> Dict[str, str]:
+    """Get normalise_category for every node of a graph, computed once per graph object.
+
+    The mapping is shared between callers and must be treated as read-only.
+    """
+    return _derived(graph, "node_categories", _build_node_categories)
+
+
+def _build_node_categories(graph: nx.MultiDiGraph) -> Dict[str, str]:
+    return {node: normalise_category(attrs) for node, attrs in graph.nodes(data=True)}
+
+
 def normalise_category(attrs: Mapping[str, Any]) -> str:
     category = attrs.get("category") or attrs.get("kind")
     if isinstance(category, str) and category:
@@ -22,6 +120,55 @@ def normalise_category(attrs: Mapping[str, Any]) -> str:
     return "unknown"
 
 
+def _graph_node_snapshot(node_id: str, attrs: Mapping[str, Any]) -> Dict[str, Any]:
+    snapshot = {
+        "id": node_id,
+        "label": attrs.get("label"),
+        "kind": attrs.get("kind"),
+        "category": normalise_category(attrs),
+        "file_path": attrs.get("file_path"),
+    }
+    # Include summary if available in graph attributes
+    summary = attrs.get("summary") or attrs.get("docstring")
+    if summary:
+        snapshot["summary"] = summary
+    return snapshot
+
+
+def _profile_snapshot(record: Any) -> Dict[str, Any]:
+    snapshot = {
+        "id": record.id,
+        "label": f"{record.class_name or ''}{':' if record.class_name and record.function_name else ''}{record.function_name or record.class_name or 'unknown'}",
+        "kind": record.kind,
+        "category": "implementation",  # Default category for ProfileRecord lookups
+        "file_path": record.file_path,
+    }
+    # Include docstring from database as summary
+    if record.docstring:
+        snapshot["summary"] = record.docstring
+    return snapshot
+
+
+def _load_profile_snapshots(node_ids: Sequence[str], workspace_id: str, database_url: str) -> Dict[str, Dict[str, Any]]:
+    """Fetch ProfileRecord snapshots for several ids in one query (empty on lookup failure)."""
+    try:
+        from structural_scaffolding.database import ProfileRecord, create_session
+        from sqlalchemy import select
+
+        session = create_session(database_url)
+        try:
+            stmt = select(ProfileRecord).where(
+                ProfileRecord.workspace_id == workspace_id,
+                ProfileRecord.id.in_(node_ids),
+            )
+            return {record.id: _profile_snapshot(record) for record in session.execute(stmt).scalars()}
+        finally:
+            session.close()
+    except Exception:
+        # If ProfileRecord lookup fails, callers raise KeyError for the missing ids
+        return {}
+
+
 def node_snapshot(graph: nx.MultiDiGraph, node_id: str, workspace_id: str | None = None, database_url: str | None = None) -> Dict[str, Any]:
     """Create a snapshot of a node's metadata, including docstring/summary.
 
@@ -38,55 +185,45 @@ def node_snapshot(graph: nx.MultiDiGraph, node_id: str, workspace_id: str | None
     Returns:
         Dict with fields: id, label, kind, category, file_path, summary (optional)
     """
-    # Try graph first
-    if node_id in graph.nodes:
-        attrs = graph.nodes[node_id]
-        snapshot = {
-            "id": node_id,
-            "label": attrs.get("label"),
-            "kind": attrs.get("kind"),
-            "category": normalise_category(attrs),
-            "file_path": attrs.get("file_path"),
-        }
-        # Include summary if available in graph attributes
-        summary = attrs.get("summary") or attrs.get("docstring")
-        if summary:
-            snapshot["summary"] = summary
-        return snapshot
-
-    # Fallback: try ProfileRecord if node not in graph
-    if workspace_id and database_url:
-        try:
-            from structural_scaffolding.database import ProfileRecord, create_session
-            from sqlalchemy import select
-
-            session = create_session(database_url)
-            try:
-                stmt = select(ProfileRecord).where(
-                    ProfileRecord.workspace_id == workspace_id,
-                    ProfileRecord.id == node_id,
-                )
-                record = session.execute(stmt).scalar_one_or_none()
-                if record:
-                    snapshot = {
-                        "id": node_id,
-                        "label": f"{record.class_name or ''}{':' if record.class_name and record.function_name else ''}{record.function_name or record.class_name or 'unknown'}",
-                        "kind": record.kind,
-                        "category": "implementation",  # Default category for ProfileRecord lookups
-                        "file_path": record.file_path,
-                    }
-                    # Include docstring from database as summary
-                    if record.docstring:
-                        snapshot["summary"] = record.docstring
-                    return snapshot
-            finally:
-                session.close()
-        except Exception:
-            # If ProfileRecord lookup fails, continue to raise KeyError
-            pass
-
-    # Node not found anywhere
-    raise KeyError(f"Node '{node_id}' not found in graph or database")
+    return node_snapshots(graph, [node_id], workspace_id, database_url)[0]
+
+
+def node_snapshots(
+    graph: nx.MultiDiGraph,
+    node_ids: Sequence[str],
+    workspace_id: str | None = None,
+    database_url: str | None = None,
+) -> List[Dict[str, Any]]:
+    """Batch form of node_snapshot, returning snapshots in ``node_ids`` order.
+
+    Graph nodes are read in memory and memoised per graph object (treat the
+    graph as read-only); ids missing from the graph are looked up in
+    ProfileRecord with a single IN query rather than one query per id. Each
+    call returns fresh dicts, so callers may update them.
+
+    Raises:
+        KeyError: If a node is in neither the graph nor the database.
+    """
+    missing = [node_id for node_id in dict.fromkeys(node_ids) if node_id not in graph]
+    profiles: Dict[str, Dict[str, Any]] = {}
+    if missing and workspace_id and database_url:
+        profiles = _load_profile_snapshots(missing, workspace_id, database_url)
+
+    cache: Dict[str, Dict[str, Any]] = _derived(graph, "snapshots", lambda _: {})
+    node_attrs = graph.nodes
+    snapshots = []
+    for node_id in node_ids:
+        if node_id in graph:
+            snapshot = cache.get(node_id)
+            if snapshot is None:
+                snapshot = cache[node_id] = _graph_node_snapshot(node_id, node_attrs[node_id])
+            snapshots.append(dict(snapshot))
+        elif node_id in profiles:
+            snapshots.append(dict(profiles[node_id]))
+        else:
+            # Node not found anywhere
+            raise KeyError(f"Node '{node_id}' not found in graph or database")
+    return snapshots
 
 
 def _match_value(value: Any, expected: Any) -> bool:
@@ -109,7 +246,12 @@ def matches_attributes(attrs: Mapping[str, Any], filters: Optional[Mapping[str,
     return True
 
 
-def _edge_passes(edge_attrs: Mapping[str, Any], allowed_types: Optional[Set[str]]) -> bool:
+def normalise_edge_types(edge_types: Optional[Sequence[str]]) -> Optional[FrozenSet[str]]:
+    """Upper-cased edge-type filter, built once and passed as ``allowed_types`` to the iterators."""
+    return frozenset(edge_type.upper() for edge_type in edge_types) if edge_types else None
+
+
+def _edge_passes(edge_attrs: Mapping[str, Any], allowed_types: Optional[AbstractSet[str]]) -> bool:
     if not allowed_types:
         return True
     edge_type = str(edge_attrs.get("type") or "").upper()
@@ -122,19 +264,25 @@ def iter_edge_bundles(
     *,
     direction: str,
     edge_types: Optional[Sequence[str]] = None,
+    allowed_types: Optional[FrozenSet[str]] = None,
 ) -> Iterator[Tuple[str, List[Mapping[str, Any]]]]:
-    """Yield (neighbor_id, edge_attrs_list) tuples for inbound or outbound edges."""
+    """Yield (neighbor_id, edge_attrs_list) tuples for inbound or outbound edges.
+
+    Callers iterating several nodes or directions can pass a precomputed
+    ``allowed_types`` (normalise_edge_types) instead of ``edge_types``.
+    """
     if node_id not in graph:
         return
 
-    allowed_types = {edge_type.upper() for edge_type in edge_types} if edge_types else None
+    if allowed_types is None:
+        allowed_types = normalise_edge_types(edge_types)
 
     if direction == "in":
         iterator = graph.predecessors(node_id)
-        accessor = lambda neighbor: graph.get_edge_data(neighbor, node_id) or {}
+        accessor = lambda neighbor: graph.get_edge_data(neighbor, node_id) or EMPTY_ATTRS
     elif direction == "out":
         iterator = graph.successors(node_id)
-        accessor = lambda neighbor: graph.get_edge_data(node_id, neighbor) or {}
+        accessor = lambda neighbor: graph.get_edge_data(node_id, neighbor) or EMPTY_ATTRS
     else:
         raise ValueError(f"Unsupported direction '{direction}'. Expected 'in' or 'out'.")
 
@@ -188,12 +336,11 @@ def iter_neighbors_by_type(
     node_id: str,
     *,
     edge_types: Optional[Sequence[str]] = None,
+    allowed_types: Optional[FrozenSet[str]] = None,
 ) -> Iterator[EdgeHop]:
-    allowed = {edge_type.upper() for edge_type in edge_types} if edge_types else None
-    for neighbor in graph.successors(node_id):
-        edge_data = graph.get_edge_data(node_id, neighbor) or {}
-        for attrs in _iter_attrs(edge_data):
-            edge_type = str(attrs.get("type") or "").upper()
-            if allowed and edge_type not in allowed:
-                continue
-            yield EdgeHop(neighbor=neighbor, edge_type=edge_type)
+    allowed = allowed_types if allowed_types is not None else normalise_edge_types(edge_types)
+    for _, neighbor, raw_type in graph.out_edges(node_id, data="type"):
+        edge_type = str(raw_type or "").upper()
+        if allowed and edge_type not in allowed:
+            continue
+        yield EdgeHop(neighbor=neighbor, edge_type=edge_type)
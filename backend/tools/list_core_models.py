@@ -3,21 +3,34 @@
 from __future__ import annotations
 
 import ast
+import hashlib
 import logging
 import textwrap
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
 from langchain_core.tools import BaseTool, tool
 from pydantic import BaseModel, Field
-from sqlalchemy import select
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import load_only
+from sqlalchemy.sql.elements import ColumnElement
 
 from structural_scaffolding.database import ProfileRecord, create_session
 
 DEFAULT_DIRECTORIES: Tuple[str, ...] = ("api", "db")
 DEFAULT_LIMIT = 50
 LOGGER = logging.getLogger(__name__)
+_SCHEMA_COLUMNS = (
+    ProfileRecord.id,
+    ProfileRecord.class_name,
+    ProfileRecord.file_path,
+    ProfileRecord.start_line,
+    ProfileRecord.end_line,
+    ProfileRecord.source_code,
+    ProfileRecord.data,
+)
 
 
 class ListCoreModelsInput(BaseModel):
@@ -43,9 +56,18 @@ def _load_model_profiles(
 ) -> List[ProfileRecord]:
     session = create_session(database_url)
     try:
-        stmt = select(ProfileRecord).where(ProfileRecord.workspace_id == workspace_id, ProfileRecord.kind == "class")
-        results = session.execute(stmt).scalars()
         include_dirs = _normalise_directories(directories)
+        # Only the columns _profile_to_schema reads; rows are used after the session
+        # closes, so these are loaded eagerly rather than deferred.
+        stmt = (
+            select(ProfileRecord)
+            .options(load_only(*_SCHEMA_COLUMNS))
+            .where(ProfileRecord.workspace_id == workspace_id, ProfileRecord.kind == "class")
+        )
+        prefilter = _directory_prefilter(include_dirs)
+        if prefilter is not None:
+            stmt = stmt.where(prefilter)
+        results = session.execute(stmt).scalars()
         matches = []
         for record in results:
             if include_dirs and not _path_matches(record.file_path, include_dirs):
@@ -58,6 +80,20 @@ def _load_model_profiles(
         session.close()
 
 
+def _directory_prefilter(directories: Sequence[str]) -> Optional[ColumnElement[bool]]:
+    """SQL pre-filter keeping only paths that contain every segment of some directory.
+
+    A superset of _path_matches (which still runs on each row) so non-matching
+    classes are not transferred at all; separators are left to the Python check.
+    """
+    clauses = []
+    for directory in directories:
+        tokens = [part for part in directory.split("/") if part]
+        if tokens:
+            clauses.append(and_(*(ProfileRecord.file_path.contains(token, autoescape=True) for token in tokens)))
+    return or_(*clauses) if clauses else None
+
+
 def _normalise_directories(directories: Optional[Sequence[str]]) -> Tuple[str, ...]:
     if not directories:
         return DEFAULT_DIRECTORIES
@@ -65,40 +101,103 @@ def _normalise_directories(directories: Optional[Sequence[str]]) -> Tuple[str, .
     return cleaned or DEFAULT_DIRECTORIES
 
 
+@lru_cache(maxsize=64)
+def _directory_needles(directories: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Each directory as a "/seg/.../" needle (empty segments dropped)."""
+    needles = []
+    for directory in directories:
+        dir_tokens = [part for part in directory.split("/") if part]
+        if dir_tokens:
+            needles.append("/" + "/".join(dir_tokens) + "/")
+    return tuple(needles)
+
+
 def _path_matches(file_path: str, directories: Sequence[str]) -> bool:
     if not directories:
         return True
     normalised = file_path.replace("\\", "/").lstrip("./")
-    path_tokens = tuple(part for part in normalised.split("/") if part)
+    path_tokens = [part for part in normalised.split("/") if part]
     if not path_tokens:
         return False
-    for directory in directories:
-        dir_tokens = tuple(part for part in directory.split("/") if part)
-        if not dir_tokens:
-            continue
-        window = len(dir_tokens)
-        for start in range(len(path_tokens) - window + 1):
-            if path_tokens[start : start + window] == dir_tokens:
-                return True
-    return False
+    # A run of whole path segments equals the directory iff "/dir/" occurs in "/path/"
+    haystack = "/" + "/".join(path_tokens) + "/"
+    return any(needle in haystack for needle in _directory_needles(tuple(directories)))
+
+
+class _UnkeyedSource:
+    """Source text passed through the schema cache without taking part in its key."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: Optional[str]) -> None:
+        self.text = text
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _UnkeyedSource)
+
+    def __hash__(self) -> int:
+        return 0
 
 
 def _profile_to_schema(record: ProfileRecord) -> Dict[str, Any]:
-    source = textwrap.dedent(record.source_code)
+    """Schema for a class profile; memoised on its fields and a source digest, so treat the result as read-only."""
+    source_digest = hashlib.blake2b(record.source_code.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    source = _UnkeyedSource(record.source_code)
+    try:
+        return _cached_schema(
+            record.id,
+            record.class_name,
+            _lookup_qualified_name(record),
+            record.file_path,
+            record.start_line,
+            record.end_line,
+            source_digest,
+            source,
+        )
+    finally:
+        # On a miss the cache keeps this object in its key; drop the text it holds
+        source.text = None
+
+
+@lru_cache(maxsize=2048)
+def _cached_schema(
+    node_id: str,
+    class_name: Optional[str],
+    qualified_name: Optional[str],
+    file_path: str,
+    start_line: int,
+    end_line: int,
+    source_digest: bytes,
+    source: _UnkeyedSource,
+) -> Dict[str, Any]:
+    return _schema_for_class(node_id, class_name, qualified_name, file_path, start_line, end_line, source.text)
+
+
+def _schema_for_class(
+    node_id: str,
+    class_name: Optional[str],
+    qualified_name: Optional[str],
+    file_path: str,
+    start_line: int,
+    end_line: int,
+    source_code: str,
+) -> Dict[str, Any]:
+    fallback = (node_id, class_name, qualified_name, file_path, start_line, end_line)
+    source = textwrap.dedent(source_code)
     try:
         module = ast.parse(source)
     except SyntaxError as exc:
-        LOGGER.debug("Failed to parse class profile %s (%s:%s): %s", record.id, record.file_path, record.start_line, exc)
-        return _fallback_schema(record)
+        LOGGER.debug("Failed to parse class profile %s (%s:%s): %s", node_id, file_path, start_line, exc)
+        return _fallback_schema(*fallback)
 
     class_node = next((n for n in getattr(module, "body", []) if isinstance(n, ast.ClassDef)), None)
     if class_node is None:
-        return _fallback_schema(record)
+        return _fallback_schema(*fallback)
 
     fields: List[_FieldSchema] = []
     meta_payload: Dict[str, Any] = {}
     for statement in class_node.body:
-        extracted = _extract_field_schema(statement, record.start_line)
+        extracted = _extract_field_schema(statement, start_line)
         if extracted:
             fields.extend(extracted)
             continue
@@ -107,12 +206,12 @@ def _profile_to_schema(record: ProfileRecord) -> Dict[str, Any]:
 
     bases = [v for v in (_safe_unparse(base) for base in class_node.bases) if v]
     schema = {
-        "node_id": record.id,
+        "node_id": node_id,
         "model_name": class_node.name,
-        "qualified_name": _lookup_qualified_name(record),
-        "file_path": record.file_path,
-        "start_line": record.start_line,
-        "end_line": record.end_line,
+        "qualified_name": qualified_name,
+        "file_path": file_path,
+        "start_line": start_line,
+        "end_line": end_line,
         "bases": bases or None,
         "fields": [_field_to_payload(f) for f in fields],
         "meta": meta_payload or None,
@@ -195,22 +294,45 @@ def _safe_literal_eval(node: ast.AST) -> Any:
 def _safe_unparse(node: Optional[ast.AST]) -> Optional[str]:
     if node is None:
         return None
+    # Field types and bases are almost always plain dotted names; skip the full unparser for those
+    dotted = _dotted_name(node)
+    if dotted is not None:
+        return dotted
     try:
         return ast.unparse(node)
     except Exception:
         return None
 
 
-def _fallback_schema(record: ProfileRecord) -> Dict[str, Any]:
+def _dotted_name(node: ast.AST) -> Optional[str]:
+    """``a.b.c`` for a Name/Attribute chain (as ast.unparse renders it), else None."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def _fallback_schema(
+    node_id: str,
+    class_name: Optional[str],
+    qualified_name: Optional[str],
+    file_path: str,
+    start_line: int,
+    end_line: int,
+) -> Dict[str, Any]:
     return {
         k: v
         for k, v in {
-            "node_id": record.id,
-            "model_name": record.class_name,
-            "qualified_name": _lookup_qualified_name(record),
-            "file_path": record.file_path,
-            "start_line": record.start_line,
-            "end_line": record.end_line,
+            "node_id": node_id,
+            "model_name": class_name,
+            "qualified_name": qualified_name,
+            "file_path": file_path,
+            "start_line": start_line,
+            "end_line": end_line,
         }.items()
         if v is not None
     }
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import heapq
 from collections import defaultdict
 from pathlib import PurePosixPath
 from typing import Any, Dict, List, Optional, Set, Tuple
@@ -11,7 +12,7 @@ from langchain_core.tools import BaseTool, tool
 from pydantic import BaseModel, Field
 
 from .call_graph_pagerank import _compute_pagerank
-from .graph_queries import get_graph, normalise_category
+from .graph_queries import EMPTY_ATTRS, get_call_projection, get_graph, get_node_categories, normalise_category
 
 DEFAULT_LIMIT = 20
 DEFAULT_NODES_PER_DIR = 5
@@ -88,8 +89,9 @@ def _group_nodes_by_directory(
     """Group nodes by their directory at the specified depth."""
     groups: Dict[str, List[Tuple[str, float, Dict[str, Any]]]] = defaultdict(list)
 
+    node_attrs = graph.nodes
     for node_id, score in scores.items():
-        attrs = graph.nodes.get(node_id, {})
+        attrs = node_attrs.get(node_id, EMPTY_ATTRS)
         file_path = attrs.get("file_path")
         if not file_path:
             continue
@@ -105,14 +107,20 @@ def _group_nodes_by_directory(
 
 def _rank_directories(
     groups: Dict[str, List[Tuple[str, float, Dict[str, Any]]]],
+    limit: Optional[int] = None,
 ) -> List[Tuple[str, float, float]]:
-    """Rank directories by average PageRank score (not aggregate, to avoid bias toward large dirs)."""
+    """Rank directories by average PageRank score (not aggregate, to avoid bias toward large dirs).
+
+    With ``limit``, only the top ``limit`` directories are selected (partial heap, not a full sort).
+    """
     dir_scores: List[Tuple[str, float, float]] = []
     for directory, nodes in groups.items():
         total_score = sum(score for _, score, _ in nodes)
         avg_score = total_score / len(nodes) if nodes else 0.0
         dir_scores.append((directory, avg_score, total_score))
     # Sort by average score (descending)
+    if limit is not None:
+        return heapq.nlargest(limit, dir_scores, key=lambda x: x[1])
     return sorted(dir_scores, key=lambda x: x[1], reverse=True)
 
 
@@ -124,7 +132,7 @@ def _format_directory_component(
     total_score: float,
 ) -> Dict[str, Any]:
     """Format a directory component with its top nodes."""
-    sorted_nodes = sorted(nodes, key=lambda x: x[1], reverse=True)[:nodes_per_dir]
+    sorted_nodes = heapq.nlargest(nodes_per_dir, nodes, key=lambda x: x[1])
 
     top_nodes = []
     for node_id, score, attrs in sorted_nodes:
@@ -177,14 +185,19 @@ def build_list_directory_components_tool(workspace_id: str, database_url: str |
         if graph.number_of_nodes() == 0:
             return []
 
-        scores = _compute_pagerank(graph)
+        scores = _compute_pagerank(
+            graph,
+            get_call_projection(graph),
+            get_node_categories(graph),
+        )
         if not scores:
             return []
 
         # Find common prefix across all file paths
         file_paths: Set[str] = set()
+        node_attrs = graph.nodes
         for node_id in scores:
-            attrs = graph.nodes.get(node_id, {})
+            attrs = node_attrs.get(node_id, EMPTY_ATTRS)
             fp = attrs.get("file_path")
             if fp:
                 file_paths.add(fp)
@@ -196,10 +209,10 @@ def build_list_directory_components_tool(workspace_id: str, database_url: str |
         if not groups:
             return []
 
-        dir_rankings = _rank_directories(groups)
+        dir_rankings = _rank_directories(groups, limit)
 
         result = []
-        for directory, avg_score, total_score in dir_rankings[:limit]:
+        for directory, avg_score, total_score in dir_rankings:
             nodes = groups[directory]
             component = _format_directory_component(directory, nodes, nodes_per_dir, avg_score, total_score)
             result.append(component)
@@ -9,7 +9,7 @@ from typing import Any, Dict, Optional
 
 from structural_scaffolding import ProfileExtractor
 from structural_scaffolding.database import persist_profiles
-from tools.graph_cache import save_graph
+from tools.graph_cache import clear_graph_cache, save_graph
 
 
 @dataclass
@@ -115,6 +115,9 @@ class Workspace:
         call_graph = extractor.call_graph
         if call_graph is not None:
             save_graph(self.workspace_id, call_graph.graph)
+        else:
+            # save_graph clears derived caches; profile-based ones (e.g. classes in scope) still need it
+            clear_graph_cache()
 
         return stored
 